@@ -0,0 +1,36 @@
+"""add_users_keyset_indexes
+
+Revision ID: 3f1c9a7b2e64
+Revises: 51280404d243
+Create Date: 2026-10-16 09:12:05.114203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7b2e64'
+down_revision: Union[str, None] = '51280404d243'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset cursors need a created_at on every row: rows from before it was
+    # tracked (or copied over as NULL) sort as the oldest
+    op.execute("UPDATE users SET created_at = TIMESTAMP '1970-01-01 00:00:00' WHERE created_at IS NULL")
+    op.alter_column('users', 'created_at', existing_type=sa.DateTime(), nullable=False)
+    # Keyset pagination of GET /admin/users on (created_at, id), per tenant and overall
+    op.create_index('ix_users_tenant_created', 'users', ['tenant_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_users_created', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created', table_name='users')
+    op.drop_index('ix_users_tenant_created', table_name='users')
+    op.alter_column('users', 'created_at', existing_type=sa.DateTime(), nullable=True)
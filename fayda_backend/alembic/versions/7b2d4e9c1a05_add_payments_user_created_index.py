@@ -0,0 +1,34 @@
+"""add_payments_user_created_index
+
+Revision ID: 7b2d4e9c1a05
+Revises: 3f1c9a7b2e64
+Create Date: 2026-10-16 10:02:47.550912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2d4e9c1a05'
+down_revision: Union[str, None] = '3f1c9a7b2e64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset cursors need a created_at on every row: rows from before it was
+    # tracked (or copied over as NULL) sort as the oldest
+    op.execute("UPDATE payments SET created_at = TIMESTAMP '1970-01-01 00:00:00' WHERE created_at IS NULL")
+    op.alter_column('payments', 'created_at', existing_type=sa.DateTime(), nullable=False)
+    # Keyset pagination of a user's payment history on (created_at, id)
+    op.create_index('ix_payments_user_created', 'payments', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payments_user_created', table_name='payments')
+    op.alter_column('payments', 'created_at', existing_type=sa.DateTime(), nullable=True)
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
+from typing import Optional
+import uuid
+from app.core.pagination import clamp_limit, set_page_headers
 from app.db.session import get_db
+from app.db.replicas import get_read_db
 from app.core.security import get_current_user, verify_admin_role
 from app.crud import user as crud_user
 from app.schemas.user import UserOut
@@ -9,10 +13,34 @@ router = APIRouter()
 
 @router.get("/users", response_model=list[UserOut])
 def get_all_users(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    status: Optional[str] = None,
+    role: Optional[str] = None,
+    plan_type: Optional[str] = None,
+    tenant_id: Optional[uuid.UUID] = None,
+    db: Session = Depends(get_read_db),
     _: dict = Depends(verify_admin_role)
 ):
-    return crud_user.get_users(db)
+    """
+    List users newest first, one page at a time.
+
+    The next page's cursor is returned in the ``X-Next-Cursor`` and ``Link``
+    headers; pass it back as ``?cursor=`` with the same filters.
+    """
+    users, next_cursor = crud_user.get_users_page(
+        db,
+        limit=clamp_limit(limit),
+        cursor=cursor,
+        status=status,
+        role=role,
+        plan_type=plan_type,
+        tenant_id=tenant_id,
+    )
+    set_page_headers(request, response, next_cursor)
+    return users
 
 @router.put("/users/{user_id}/status", response_model=UserOut)
 def change_user_status(
@@ -1,29 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, Form
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.models.user import User
-from app.core.security import verify_password
 from app.core.config import settings
-from jose import jwt
-from datetime import datetime, timedelta
+from app.services.password_service import password_hasher
+from app.services.auth_service import token_claims
+from app.auth.jwt import create_access_token
+from datetime import timedelta
 
 router = APIRouter()
 
 @router.post("/login")
-def login(
+async def login(
     username: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == username).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = (await db.execute(select(User).where(User.email == username))).scalar_one_or_none()
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # Stored hash used a different bcrypt cost: upgrade it transparently
+        user.hashed_password = new_hash
+        await db.commit()
 
-    to_encode = {
-        "sub": user.email,
-        "role": user.role,  # 👈 This is critical
-        "exp": datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    }
-
-    access_token = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    # sub, role and tenant_id: tenant-scoped routes resolve the tenant from the token
+    access_token = create_access_token(
+        token_claims(user), expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
+    )
     return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from typing import Literal, Optional
+import os
+from app.core.static_files import file_response
+from app.services.avatar_store import avatar_store
+from app.services.avatar_variants import FORMATS, AvatarVariantError, avatar_variants
+
+router = APIRouter()
+
+@router.get("/{name}")
+async def get_avatar_variant(
+    name: str,
+    request: Request,
+    size: int = Query(64, ge=1, le=4096),
+    format: Optional[Literal["webp", "jpeg"]] = None,
+):
+    """
+    Square thumbnail of a stored avatar, ``name`` being the last segment of
+    its ``avatar_url``.
+
+    ``size`` is rounded up to the nearest configured variant size (capped at
+    the largest). Without ``format``, WebP is served to clients that accept
+    it and JPEG to the rest. Variants are rendered on first request and
+    served from disk after that. Variant URLs are content-addressed, so
+    responses are cacheable as immutable and revalidate with a 304.
+    """
+    source = avatar_store.stored_path(name)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+    negotiated = format is None
+    if negotiated:
+        format = "webp" if "image/webp" in request.headers.get("accept", "") else "jpeg"
+    try:
+        path = await avatar_variants.get(source, avatar_variants.pick_size(size), format)
+    except AvatarVariantError:
+        raise HTTPException(status_code=422, detail="Avatar cannot be resized")
+    _, media_type = FORMATS[format]
+    stat_result = await run_in_threadpool(os.stat, path)
+    return file_response(
+        path,
+        stat_result,
+        request.headers,
+        headers={"Vary": "Accept"} if negotiated else None,
+        media_type=media_type,
+    )
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Literal, Optional
+import uuid
+from app.core.security import verify_admin_role
+from app.services.export_service import export_stream
+
+router = APIRouter()
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: Literal["users", "payments", "audit-events"],
+    format: Literal["csv", "ndjson"] = "csv",
+    gzip: bool = False,
+    tenant_id: Optional[uuid.UUID] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    _: dict = Depends(verify_admin_role)
+):
+    """
+    Stream a full dataset export as CSV or NDJSON, optionally gzipped.
+
+    Rows are read from a server-side cursor and written as they arrive, so
+    exports of any size run in constant memory. ``date_from`` is inclusive
+    and ``date_to`` exclusive, both on ``created_at``.
+    """
+    body = export_stream(dataset, format, gzip=gzip, tenant_id=tenant_id, date_from=date_from, date_to=date_to)
+    filename = f"{dataset}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+from app.services.fayda_client import fayda_client
+from app.services.password_service import password_hasher
+from app.db.pool import pool_stats
+from app.db.replicas import replica_set
+from app.core.startup import startup_timer
+
+router = APIRouter()
+
+@router.get("")
+def health():
+    """
+    Liveness plus dependency state for load balancers and dashboards.
+
+    Always 200 while the process is serving; ``status`` is ``degraded`` when
+    the Fayda breaker is not closed and ID checks are using the fallback.
+    """
+    breaker = fayda_client.breaker.snapshot()
+    return {
+        "status": "ok" if breaker["state"] == "closed" else "degraded",
+        "fayda_upstream": breaker,
+        "password_hashing": password_hasher.stats(),
+        "db_pool": pool_stats(),
+        "db_replicas": replica_set.stats(),
+        "startup": startup_timer.snapshot(),
+    }
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from app.core.metrics import render_metrics
+
+router = APIRouter()
+
+@router.get("", include_in_schema=False)
+def metrics():
+    """Prometheus exposition of request, dependency and cache metrics."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
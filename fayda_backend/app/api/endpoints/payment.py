@@ -1,27 +1,58 @@
 # app/api/endpoints/payment.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional
+from app.core.pagination import clamp_limit, set_page_headers
 from app.schemas.payment import PaymentCreate, PaymentOut
-from app.core.security import get_current_user
-from app.db.session import get_db
+from app.core.security import get_current_principal
+from app.core.principal import Principal
+from app.db.session import get_async_db
+from app.db.replicas import get_async_read_db
 from app.crud import payment as crud_payment
-from app.models.user import User
 
 router = APIRouter()
 
+async def payment_filters(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    status: Optional[str] = None,
+    method: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> dict:
+    """Query parameters shared by the payment history routes"""
+    return {
+        "limit": clamp_limit(limit),
+        "cursor": cursor,
+        "status": status,
+        "method": method,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+
+async def list_user_payments(request: Request, response: Response, db: AsyncSession, user_id: int, filters: dict):
+    """One page of a user's payments; the next cursor goes in the response headers"""
+    payments, next_cursor = await crud_payment.get_payments_page_async(db, user_id=user_id, **filters)
+    set_page_headers(request, response, next_cursor)
+    return payments
+
 @router.post("/", response_model=PaymentOut)
-def simulate_payment(
+async def simulate_payment(
     payment_in: PaymentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    payment = crud_payment.create_payment(db, current_user.id, payment_in)
+    payment = await crud_payment.create_payment_async(db, current_user.id, payment_in, tenant_id=current_user.tenant_id)
     return payment
 
 @router.get("/", response_model=list[PaymentOut])
-def get_user_payments(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_user_payments(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(payment_filters),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    return crud_payment.get_payments_by_user(db, current_user.id)
+    return await list_user_payments(request, response, db, current_user.id, filters)
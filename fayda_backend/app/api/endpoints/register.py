@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.schemas.user import UserCreate, UserOut
 from app.crud import user as crud_user
+from app.services.password_service import password_hasher
 
 router = APIRouter()
 
 @router.post("/", response_model=UserOut)
-def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(crud_user.User).filter_by(email=user_in.email).first()
+async def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(lambda: db.query(crud_user.User).filter_by(email=user_in.email).first())
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return crud_user.create_user(db, user_in)
+    hashed_password = await password_hasher.hash(user_in.password)
+    return await run_in_threadpool(crud_user.create_user, db, user_in, hashed_password)
@@ -1,63 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserBase, UserUpdate, UserPasswordUpdate
 from app.core.security import (
-    get_password_hash,
-    verify_password,
     get_current_user,
+    get_current_user_async,
+    get_current_principal,
 )
-from app.db.session import get_db
-from app.models.payment import Payment  # Import Payment model!
-import shutil, os
-
-# Determine the base directory two levels up (../..)
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+from app.core.principal import Principal, invalidate_principal
+from app.db.session import get_db, get_async_db
+from app.db.replicas import get_async_read_db
+from app.schemas.payment import PaymentOut
+from app.api.endpoints.payment import payment_filters, list_user_payments
+from app.services.password_service import password_hasher
+from app.services.avatar_store import avatar_store
+from app.services.avatar_variants import avatar_variants
 
 router = APIRouter()
 
 @router.get("/me", response_model=UserBase)
-def get_profile(current_user: User = Depends(get_current_user)):
+async def get_profile(current_user: User = Depends(get_current_user_async)):
     return current_user
 
 @router.put("/users/me", response_model=UserBase)
 def update_profile(update: UserUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    old_email = current_user.email
     for attr, value in update.dict(exclude_unset=True).items():
         setattr(current_user, attr, value)
     db.commit()
     db.refresh(current_user)
+    invalidate_principal(old_email, current_user.email)
     return current_user
 
 @router.put("/users/me/password")
-def change_password(pw: UserPasswordUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    if not verify_password(pw.old_password, current_user.hashed_password):
+async def change_password(pw: UserPasswordUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    if not await password_hasher.verify(pw.old_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect password")
-    current_user.hashed_password = get_password_hash(pw.new_password)
-    db.commit()
+    current_user.hashed_password = await password_hasher.hash(pw.new_password)
+    await run_in_threadpool(db.commit)
+    invalidate_principal(current_user.email)
     return {"msg": "Password updated"}
 
-ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png", "gif"}
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+AVATAR_PATH = "/users/me/avatar"
 
-@router.post("/users/me/avatar")
-def upload_avatar(file: UploadFile = File(...), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    if not allowed_file(file.filename):
-        raise HTTPException(status_code=400, detail="Invalid file type.")
-    # Use a consistent path under the backend directory
-    upload_dir = os.path.join(BASE_DIR, "static", "avatars")
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, f"{current_user.id}_{file.filename}")
-    with open(file_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
-    # Store the URL relative to the backend base directory so it matches the mounted static path
-    relative = os.path.relpath(file_path, BASE_DIR)
-    current_user.avatar_url = "/" + relative.replace("\\", "/")
-    db.commit()
-    db.refresh(current_user)
-    return {"avatar_url": current_user.avatar_url}
+@router.post(AVATAR_PATH)
+async def upload_avatar(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    # The file type is sniffed from its content; the filename is ignored.
+    # A replaced avatar is left for the orphan GC.
+    avatar_url = await avatar_store.save(file)
+    await db.execute(update(User).where(User.id == current_user.id).values(avatar_url=avatar_url))
+    await db.commit()
+    # Thumbnails are rendered after the response; /avatars/{name} renders
+    # any that are still missing on demand
+    background_tasks.add_task(avatar_variants.pregenerate, avatar_store.path_for_url(avatar_url))
+    return {"avatar_url": avatar_url}
 
-@router.get("/me/payments")
-def get_payments(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    payments = db.query(Payment).filter(Payment.user_id == current_user.id).all()
-    return [p.to_dict() for p in payments]
+@router.get("/me/payments", response_model=list[PaymentOut])
+async def get_payments(
+    request: Request,
+    response: Response,
+    filters: dict = Depends(payment_filters),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    return await list_user_payments(request, response, db, current_user.id, filters)
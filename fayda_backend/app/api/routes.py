@@ -1,9 +1,13 @@
 from fastapi import APIRouter
 from app.api.endpoints import register, auth, admin
-from app.api.endpoints import payment
+from app.api.endpoints import payment, health, export, metrics, avatar
 
 api_router = APIRouter()
 api_router.include_router(register.router, prefix="/register", tags=["Register"])
 api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
 api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
+api_router.include_router(export.router, prefix="/admin/export", tags=["Admin"])
 api_router.include_router(payment.router, prefix="/payments", tags=["payments"])
+api_router.include_router(health.router, prefix="/health", tags=["Health"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Health"])
+api_router.include_router(avatar.router, prefix="/avatars", tags=["Avatars"])
@@ -1,26 +1,33 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")  # Adjust path as needed
-SECRET_KEY = "your-secret-key"
-ALGORITHM = "HS256"
+from app.auth.jwt import TokenClaims, decode_access_token
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+
+def get_token_claims(token: str = Depends(oauth2_scheme)) -> TokenClaims:
+    """
+    The verified subject, role and tenant of the caller's access token.
+
+    Every route authenticates through this (directly or via ``require_role``
+    and ``app.core.security``), so one token is valid everywhere.
+    """
+    try:
+        return decode_access_token(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
 def require_role(*allowed_roles):
-    def role_dependency(token: str = Depends(oauth2_scheme)):
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            role = payload.get("role")
-            email = payload.get("sub")
-            if role not in allowed_roles:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Access forbidden. Required role(s): {allowed_roles}"
-                )
-            return {"email": email, "role": role}
-        except JWTError:
+    def role_dependency(claims: TokenClaims = Depends(get_token_claims)):
+        if claims.role not in allowed_roles:
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Access forbidden. Required role(s): {allowed_roles}"
             )
+        return {"email": claims.sub, "role": claims.role, "tenant_id": claims.tenant_id}
     return role_dependency
@@ -1,9 +1,96 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from jose import jwt
+from typing import Dict, Optional
+import hashlib
+import time
+
+from jose import jwt, JWTError
+from app.core.cache import TTLCache
 from app.core.config import settings
 
+@dataclass(frozen=True)
+class TokenClaims:
+    """
+    Verified claims of an access token.
+    """
+    sub: str
+    role: Optional[str]
+    tenant_id: Optional[str]
+    exp: Optional[int]
+
+# Decoded claims keyed by SHA-256 of the raw token, kept until the token
+# expires (capped so a retired signing key stops being honoured soon).
+claims_cache = TTLCache(
+    maxsize=settings.jwt_claims_cache_max_entries,
+    ttl=settings.jwt_claims_cache_max_ttl_seconds,
+)
+
+def signing_keys() -> Dict[str, str]:
+    """All accepted keys by ``kid``; the active kid always maps to ``jwt_secret_key``."""
+    keys = dict(settings.jwt_keys)
+    keys.setdefault(settings.jwt_active_kid, settings.jwt_secret_key)
+    return keys
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    kid = settings.jwt_active_kid
+    return jwt.encode(
+        to_encode,
+        signing_keys()[kid],
+        algorithm=settings.jwt_algorithm,
+        headers={"kid": kid},
+    )
+
+def decode_access_token(token: str) -> TokenClaims:
+    """
+    Verify ``token`` and return its claims, raising ``JWTError`` if invalid.
+
+    The signing key is picked by the ``kid`` header; tokens issued before
+    key ids were introduced are tried against every accepted key, active
+    key first. Successful results are cached so hot routes verify the
+    signature once per token rather than once per request.
+    """
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    claims = claims_cache.get(digest)
+    if claims is not None:
+        return claims
+
+    kid = jwt.get_unverified_header(token).get("kid")
+    keys = signing_keys()
+    if kid is not None:
+        if kid not in keys:
+            raise JWTError("Unknown signing key")
+        candidates = [keys[kid]]
+    else:
+        candidates = [keys[settings.jwt_active_kid]] + [
+            key for key_id, key in keys.items() if key_id != settings.jwt_active_kid
+        ]
+
+    payload = None
+    for key in candidates:
+        try:
+            payload = jwt.decode(token, key, algorithms=[settings.jwt_algorithm])
+            break
+        except JWTError as exc:
+            error = exc
+    if payload is None:
+        raise error
+
+    sub = payload.get("sub")
+    if sub is None:
+        raise JWTError("Token has no subject")
+    tenant_id = payload.get("tenant_id")
+    claims = TokenClaims(
+        sub=sub,
+        role=payload.get("role"),
+        tenant_id=str(tenant_id) if tenant_id is not None else None,
+        exp=payload.get("exp"),
+    )
+
+    ttl = settings.jwt_claims_cache_max_ttl_seconds
+    if claims.exp is not None:
+        ttl = min(ttl, claims.exp - time.time())
+    claims_cache.set(digest, claims, ttl=ttl)
+    return claims
@@ -15,10 +15,10 @@ def get_db():
         db.close()
 
 @router.post("/register", response_model=Token)
-def register(data: UserCreate, db: Session = Depends(get_db)):
-    return register_user(db, data)
+async def register(data: UserCreate, db: Session = Depends(get_db)):
+    return await register_user(db, data)
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     credentials = {"username": form_data.username, "password": form_data.password}
-    return login_user(db, credentials)
+    return await login_user(db, credentials)
@@ -1,38 +1,11 @@
 # app/core/auth.py
+#
+# Kept for backwards compatibility. Tokens are verified in app.auth.jwt and
+# the current user is resolved by app.core.security, so every route accepts
+# the same tokens.
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from app.db.session import SessionLocal
-from app.models.user import User
-from sqlalchemy.orm import Session
-import os
+from app.auth.deps import oauth2_scheme
+from app.core.security import get_current_user
+from app.db.session import get_db
 
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-key")  # use env in prod!
-ALGORITHM = "HS256"
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
-    return user
+__all__ = ["oauth2_scheme", "get_current_user", "get_db"]
@@ -0,0 +1,55 @@
+# app/core/body_limit.py
+"""
+Request body size limits for upload routes.
+
+Starlette spools a multipart body to disk while parsing it, before the
+endpoint runs, so a size check inside the endpoint comes too late to keep a
+huge upload off the disk. This middleware rejects it as it arrives instead.
+"""
+
+from typing import Dict
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+TOO_LARGE = "Request body too large"
+
+
+class BodySizeLimitMiddleware:
+    """
+    Caps request bodies per path at ``limits[path]`` bytes.
+
+    A larger ``Content-Length`` is refused with 413 without reading the body;
+    chunked bodies are counted while read and fail with 413 as soon as they
+    cross the limit.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            response = JSONResponse({"detail": TOO_LARGE}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Re-raised as-is by FastAPI's body parsing
+                    raise HTTPException(status_code=413, detail=TOO_LARGE)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,169 @@
+from collections import deque
+from typing import Callable, Optional
+import threading
+import time
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker for a remote dependency.
+
+    * **closed** – calls go through; the outcome and latency of the last
+      ``window_size`` calls are kept. Once ``min_calls`` are recorded and the
+      failure rate or slow-call rate reaches its threshold, the breaker opens.
+    * **open** – calls are refused immediately for ``open_seconds``.
+    * **half_open** – up to ``half_open_max_calls`` probe calls are let
+      through. Any failure re-opens the breaker; that many successes close it.
+
+    Callers ask ``admit()`` before calling and then report the outcome with
+    ``record_success``/``record_failure`` (or ``release`` if the call was
+    abandoned without an outcome), passing back the generation ``admit()``
+    returned. Each state change starts a new generation and outcomes of calls
+    admitted in an earlier one are ignored, so calls still in flight when the
+    breaker opens can't re-open it (extending the open period) or count as
+    half-open probes they never took a slot for.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 0.8,
+        slow_call_seconds: float = 2.0,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 15.0,
+        half_open_max_calls: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window: deque = deque(maxlen=window_size)  # (failed, slow)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._generation = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def admit(self) -> Optional[int]:
+        """The generation the call is admitted in, or ``None`` if refused."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return self._generation
+            if self._state == self.HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return self._generation
+            self.rejected += 1
+            return None
+
+    def allow(self) -> bool:
+        return self.admit() is not None
+
+    def record_success(self, duration: float, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if self._is_stale(generation):
+                return
+            if self._state == self.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._close()
+                return
+            self._window.append((False, duration >= self.slow_call_seconds))
+            self._evaluate()
+
+    def record_failure(self, duration: float, generation: Optional[int] = None) -> None:
+        with self._lock:
+            if self._is_stale(generation):
+                return
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._window.append((True, duration >= self.slow_call_seconds))
+            self._evaluate()
+
+    def release(self, generation: Optional[int] = None) -> None:
+        """Give back a half-open probe slot for a call that produced no outcome."""
+        with self._lock:
+            if self._is_stale(generation):
+                return
+            if self._state == self.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._maybe_half_open()
+            calls = len(self._window)
+            failures = sum(1 for failed, _ in self._window if failed)
+            slow = sum(1 for _, is_slow in self._window if is_slow)
+            retry_in = 0.0
+            if self._state == self.OPEN:
+                retry_in = max(0.0, self._opened_at + self.open_seconds - self._clock())
+            return {
+                "name": self.name,
+                "state": self._state,
+                "window_calls": calls,
+                "failure_rate": round(failures / calls, 4) if calls else 0.0,
+                "slow_call_rate": round(slow / calls, 4) if calls else 0.0,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+                "retry_in_seconds": round(retry_in, 3),
+            }
+
+    # Internal helpers: callers must hold ``self._lock``
+
+    def _is_stale(self, generation: Optional[int]) -> bool:
+        # None: outcome reported without admit(), counted in the current state
+        self._maybe_half_open()
+        return generation is not None and generation != self._generation
+
+    def _maybe_half_open(self) -> None:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._generation += 1
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+
+    def _evaluate(self) -> None:
+        calls = len(self._window)
+        if calls < self.min_calls:
+            return
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow = sum(1 for _, is_slow in self._window if is_slow)
+        if failures / calls >= self.failure_rate_threshold or slow / calls >= self.slow_call_rate_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self._generation += 1
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._window.clear()
+        self.times_opened += 1
+
+    def _close(self) -> None:
+        self._generation += 1
+        self._state = self.CLOSED
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._window.clear()
@@ -1,20 +1,125 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
+import os
 
 class Settings(BaseSettings):
     app_name: str = "Fayda ID Checker"
     
     # Database
     database_url: str = "sqlite:///./fapp.db"
+
+    # Connection pool (per engine, per worker process). Pre-ping checks each
+    # connection on checkout (pessimistic); without it dead connections are
+    # only noticed when a query fails (optimistic) and recycled after
+    # db_pool_recycle seconds.
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 300
+    db_pool_pre_ping: bool = True
+    # PgBouncer in transaction mode: disable server-side prepared statements
+    db_pgbouncer: bool = False
+
+    # Read replicas (JSON list of URLs) for read-only routes, and how often
+    # they are health-checked; unhealthy replicas fall back to the primary
+    database_replica_urls: List[str] = []
+    db_replica_check_seconds: float = 5.0
     
     # JWT Settings
     jwt_secret_key: str = "super-secret"
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    # Key rotation: extra signing keys by kid as JSON, e.g. JWT_KEYS='{"2025-01": "old-secret"}'.
+    # New tokens are signed with jwt_secret_key under jwt_active_kid.
+    jwt_keys: Dict[str, str] = {}
+    jwt_active_kid: str = "default"
+    jwt_claims_cache_max_entries: int = 10000
+    jwt_claims_cache_max_ttl_seconds: float = 300.0
+
+    # Authenticated principal cache (id/tenant/role/status per token subject)
+    principal_cache_ttl_seconds: float = 30.0
+    principal_cache_max_entries: int = 10000
+
+    # List endpoints: default and maximum page size
+    page_size_default: int = 50
+    page_size_max: int = 200
+
+    # Rows fetched per server-side cursor batch in admin exports
+    export_batch_size: int = 1000
+
+    # bcrypt cost; calibrate per host with scripts/calibrate_bcrypt.py.
+    # Stored hashes with a different cost are upgraded on the next login.
+    bcrypt_rounds: int = 12
+
+    # Tenant registry cache
+    tenant_cache_ttl_seconds: float = 60.0
+    tenant_cache_max_entries: int = 10000
+
+    # Password hashing pool (0 workers = run in the threadpool)
+    password_hash_workers: int = max(1, min(4, os.cpu_count() or 1))
+    password_hash_max_pending: int = 64
     
     # App Environment
     app_env: str = "dev"
-    
+
+    # Startup: "dev" creates missing tables; "production" only checks that the
+    # database is at the Alembic head (or DB_EXPECTED_REVISION) and defers
+    # warming rarely used subsystems until after the app is serving
+    startup_mode: str = "dev"
+    db_expected_revision: Optional[str] = None
+
+    # Avatar uploads: size cap, and how often / after how long unreferenced
+    # files are garbage-collected
+    avatar_max_bytes: int = 5 * 1024 * 1024
+    avatar_gc_interval_seconds: float = 3600.0
+    avatar_gc_grace_seconds: float = 3600.0
+    # Square thumbnail sizes (px), rendering processes (0 = threadpool), quality
+    avatar_variant_sizes: List[int] = [32, 64, 128, 256]
+    avatar_variant_workers: int = max(1, min(2, os.cpu_count() or 1))
+    avatar_variant_quality: int = 80
+
+    # SQL profiling: slow-statement log threshold, repeats of one statement
+    # per request flagged as N+1, Server-Timing header (default: dev only)
+    sql_slow_query_ms: float = 200.0
+    sql_n_plus_one_threshold: int = 10
+    sql_server_timing: Optional[bool] = None
+
+    # Fayda upstream (ID lookup API)
+    fayda_api_url: str = "https://id.et/api"
+    fayda_api_token: str = "fake-fayda-api-token"
+    fayda_connect_timeout: float = 2.0
+    fayda_read_timeout: float = 5.0
+    fayda_pool_timeout: float = 1.0
+    fayda_max_connections: int = 100
+    fayda_max_keepalive_connections: int = 20
+    fayda_keepalive_expiry: float = 30.0
+    fayda_http2: bool = True
+    # Point ID checks at the local stand-in (python -m app.mocks.fayda_upstream)
+    fayda_use_local_stub: bool = False
+    fayda_local_stub_url: str = "http://127.0.0.1:9100/api"
+    fayda_batch_max_ids: int = 5000
+    fayda_batch_concurrency: int = 50
+
+    # Fayda lookup result cache
+    fayda_cache_enabled: bool = True
+    fayda_cache_max_entries: int = 10000
+    fayda_cache_ttl_seconds: float = 300.0
+    fayda_cache_negative_ttl_seconds: float = 30.0
+    fayda_cache_sweep_seconds: float = 5.0
+
+    # Fayda upstream circuit breaker
+    fayda_breaker_failure_rate: float = 0.5
+    fayda_breaker_slow_call_rate: float = 0.8
+    fayda_breaker_slow_call_seconds: float = 2.0
+    fayda_breaker_window_size: int = 20
+    fayda_breaker_min_calls: int = 10
+    fayda_breaker_open_seconds: float = 15.0
+    fayda_breaker_half_open_calls: int = 3
+
+    @property
+    def fayda_base_url(self) -> str:
+        return self.fayda_local_stub_url if self.fayda_use_local_stub else self.fayda_api_url
+
     # Legacy compatibility
     @property
     def secret_key(self) -> str:
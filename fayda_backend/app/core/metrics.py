@@ -0,0 +1,174 @@
+# app/core/metrics.py
+"""
+Prometheus metrics.
+
+Per-request work is a few counter/histogram updates and two clock reads, so
+collection stays on in production. Stats that the app already keeps (caches,
+connection pools, circuit breaker, request coalescing) are read only when
+``/metrics`` is scraped, by ``AppStatsCollector``.
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "db_seconds_per_request",
+    "Time spent executing SQL per HTTP request",
+    ["route"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt operation time including queueing for the hashing pool",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "bcrypt operations refused because the hashing queue was full",
+)
+FAYDA_UPSTREAM_SECONDS = Histogram(
+    "fayda_upstream_request_duration_seconds",
+    "Fayda ID API call latency by outcome",
+    ["outcome"],
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request and labels it with its route template. SQL
+    figures come from the profile ``SQLProfilerMiddleware`` leaves in the scope.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            # Templates, never raw paths: keeps label cardinality bounded
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            HTTP_REQUEST_SECONDS.labels(scope["method"], template, str(status["code"])).observe(elapsed)
+            profile = scope.get("sql_profile")
+            if profile is not None:
+                DB_QUERIES_PER_REQUEST.labels(template).observe(profile.count)
+                DB_SECONDS_PER_REQUEST.labels(template).observe(profile.seconds)
+
+class AppStatsCollector:
+    """Exports the app's own cache, pool, breaker and coalescing stats at scrape time."""
+
+    def describe(self):
+        # Nothing to pre-declare; also keeps registration from calling collect()
+        return []
+
+    def collect(self):
+        from app.auth.jwt import claims_cache
+        from app.core.principal import principal_cache
+        from app.db.pool import pool_metrics
+        from app.mocks.mock_id_api import id_lookups
+        from app.services.fayda_client import fayda_client
+        from app.services.id_cache import id_cache
+        from app.services.password_service import password_hasher
+        from app.services.tenant_registry import tenant_registry
+
+        hits = CounterMetricFamily("app_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("app_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("app_cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+        size = GaugeMetricFamily("app_cache_entries", "Entries currently cached", labels=["cache"])
+        caches = {
+            "fayda_id": id_cache.stats(),
+            "principal": principal_cache.stats(),
+            "jwt_claims": claims_cache.stats(),
+            "tenant": tenant_registry.stats(),
+        }
+        for name, stats in caches.items():
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            ratio.add_metric([name], stats["hit_ratio"])
+            size.add_metric([name], stats["size"])
+        yield from (hits, misses, ratio, size)
+
+        coalescing = id_lookups.stats(top=0)
+        yield CounterMetricFamily("fayda_lookups_executed", "Upstream ID lookups actually performed", value=coalescing["executions"])
+        yield CounterMetricFamily("fayda_lookups_coalesced", "ID lookups served by an in-flight call", value=coalescing["coalesced"])
+
+        breaker = fayda_client.breaker.snapshot()
+        state = GaugeMetricFamily("fayda_breaker_state", "1 for the Fayda circuit breaker's current state", labels=["state"])
+        for name in ("closed", "open", "half_open"):
+            state.add_metric([name], 1 if breaker["state"] == name else 0)
+        yield state
+
+        yield GaugeMetricFamily("password_hash_queue_depth", "bcrypt operations queued or running", value=password_hasher.pending)
+
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections checked out", labels=["pool"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond pool_size", labels=["pool"])
+        timeouts = CounterMetricFamily("db_pool_checkout_timeouts", "Checkouts that timed out", labels=["pool"])
+        invalidations = CounterMetricFamily("db_pool_invalidations", "Connections invalidated", labels=["pool"])
+        wait = HistogramMetricFamily("db_pool_checkout_wait_seconds", "Time waiting for a pooled connection", labels=["pool"])
+        for name, metrics in pool_metrics.items():
+            snapshot = metrics.snapshot()
+            checked_out.add_metric([name], snapshot["checked_out"])
+            overflow.add_metric([name], snapshot["overflow"])
+            timeouts.add_metric([name], snapshot["timeouts"])
+            invalidations.add_metric([name], snapshot["invalidations"])
+            waits = snapshot["wait_seconds"]
+            wait.add_metric([name], list(waits["buckets"].items()), sum_value=waits["sum"])
+        yield from (checked_out, overflow, timeouts, invalidations, wait)
+
+REGISTRY.register(AppStatsCollector())
+
+def render_metrics() -> tuple:
+    """Exposition text and content type, aggregating worker processes if configured."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        # App stats are per process: these describe the worker that was scraped
+        registry.register(AppStatsCollector())
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,73 @@
+# app/core/pagination.py
+
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+import base64
+import json
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """Page size bounded by ``page_size_max`` (``page_size_default`` if unset)."""
+    if limit is None:
+        return settings.page_size_default
+    return max(1, min(limit, settings.page_size_max))
+
+def encode_cursor(created_at: datetime, row_id: Any) -> str:
+    """Opaque cursor pointing just past the row (``created_at``, ``row_id``)."""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), row_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_page(query: Query, created_col, id_col, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of ``query`` newest first, ordered by (``created_col``, ``id_col``).
+
+    Seeks past the cursor instead of using OFFSET, so every page costs the
+    same index range scan however deep the client has paged. Returns the
+    rows and the cursor for the next page (``None`` on the last page).
+    """
+    rows = _seek(query, created_col, id_col, cursor, limit).all()
+    return _split_page(rows, created_col, id_col, limit)
+
+async def keyset_page_async(db: AsyncSession, stmt, created_col, id_col, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """``keyset_page`` for a ``select()`` of one entity run on an ``AsyncSession``."""
+    result = await db.execute(_seek(stmt, created_col, id_col, cursor, limit))
+    return _split_page(result.scalars().all(), created_col, id_col, limit)
+
+def _seek(query, created_col, id_col, cursor: Optional[str], limit: int):
+    # Works for both ORM Query and select(): both support filter/order_by/limit
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+def _split_page(rows: List[Any], created_col, id_col, limit: int) -> Tuple[List[Any], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
+
+def set_page_headers(request: Request, response: Response, next_cursor: Optional[str]) -> None:
+    """
+    Expose the next page in ``X-Next-Cursor`` and an RFC 8288 ``Link`` header,
+    keeping list bodies unchanged for existing clients.
+    """
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
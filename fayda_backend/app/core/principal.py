@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import uuid
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated caller: just what authorization needs, not the full row.
+    """
+    id: int
+    email: str
+    tenant_id: Optional[uuid.UUID]
+    role: str
+    status: str
+
+# Keyed by token subject (email). Short TTL bounds staleness if an update
+# path forgets to invalidate; the known update paths call invalidate_principal.
+principal_cache = TTLCache(
+    maxsize=settings.principal_cache_max_entries,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+
+PRINCIPAL_COLUMNS = (User.id, User.email, User.tenant_id, User.role, User.status)
+
+def _remember(email: str, row) -> Optional[Principal]:
+    if row is None:
+        return None
+    principal = Principal(id=row.id, email=row.email, tenant_id=row.tenant_id, role=row.role, status=row.status)
+    principal_cache.set(email, principal)
+    return principal
+
+def load_principal(db: Session, email: str) -> Optional[Principal]:
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+    return _remember(email, db.query(*PRINCIPAL_COLUMNS).filter(User.email == email).first())
+
+async def load_principal_async(db: AsyncSession, email: str) -> Optional[Principal]:
+    """``load_principal`` for an ``AsyncSession``"""
+    principal = principal_cache.get(email)
+    if principal is not None:
+        return principal
+    result = await db.execute(select(*PRINCIPAL_COLUMNS).where(User.email == email))
+    return _remember(email, result.first())
+
+def invalidate_principal(*emails: Optional[str]) -> None:
+    for email in emails:
+        if email:
+            principal_cache.pop(email)
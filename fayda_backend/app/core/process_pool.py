@@ -0,0 +1,66 @@
+# app/core/process_pool.py
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+import asyncio
+import logging
+import multiprocessing
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessPool:
+    """
+    Lazily started ``spawn`` process pool that replaces itself when broken.
+
+    A ``ProcessPoolExecutor`` whose worker dies (OOM kill, segfault in a C
+    extension) is marked broken and refuses all further work. ``run`` drops
+    such a pool, starts a fresh one and retries the call ``retries`` times
+    before letting ``BrokenProcessPool`` propagate to the caller.
+    """
+
+    def __init__(self, workers: int, name: str = "process pool"):
+        self.workers = workers
+        self.name = name
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        # Every call in flight on a broken pool fails at once; only the first
+        # to get here replaces it, the rest retry on the replacement
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.restarts += 1
+        logger.warning("Worker of the %s died; starting a new pool", self.name)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable, *args, retries: int = 1):
+        loop = asyncio.get_running_loop()
+        for attempt in range(retries + 1):
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                self._discard(executor)
+                if attempt == retries:
+                    raise
@@ -1,43 +1,87 @@
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional
 
 from app.models.user import User
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
+from app.db.replicas import get_async_read_db
 from app.core.config import settings
+from app.core.principal import Principal, load_principal_async
+from app.auth.deps import get_token_claims
+from app.auth.jwt import TokenClaims
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """
+    The one password context for the app. Pinning min/max rounds to the
+    configured cost makes hashes at any other cost "need update".
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    Built on first use: hashing normally runs in the password worker
+    processes, so the web process need not import passlib at startup.
+    """
+    from passlib.context import CryptContext
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.bcrypt_rounds,
+        bcrypt__min_rounds=settings.bcrypt_rounds,
+        bcrypt__max_rounds=settings.bcrypt_rounds,
+    )
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Verify, returning a re-hash at the current cost when the stored one is outdated."""
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid token or expired session",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        email = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-
-    user = db.query(User).filter(User.email == email).first()
+
+async def get_current_principal(
+    claims: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    """
+    Resolve the caller from the per-process principal cache.
+
+    Prefer this over ``get_current_user`` for routes that only need the
+    caller's id, tenant or role: on a cache hit it costs no DB round trip,
+    and a miss is awaited on the event loop rather than a worker thread.
+    """
+    principal = await load_principal_async(db, claims.sub)
+    if principal is None:
+        raise _credentials_exception()
+    return principal
+
+def get_current_user(claims: TokenClaims = Depends(get_token_claims), db: Session = Depends(get_db)) -> User:
+    """Load the caller's full ``User`` row, for routes that read or modify it."""
+    user = db.query(User).filter(User.email == claims.sub).first()
+    if not user:
+        raise _credentials_exception()
+    return user
+
+async def get_current_user_async(
+    claims: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> User:
+    """``get_current_user`` through an async read session, for read-only routes."""
+    user = (await db.execute(select(User).where(User.email == claims.sub))).scalar_one_or_none()
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
-def verify_admin_role(current_user: User = Depends(get_current_user)) -> User:
+def verify_admin_role(current_user: Principal = Depends(get_current_principal)) -> Principal:
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized as admin")
     return current_user
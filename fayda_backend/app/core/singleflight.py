@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+import asyncio
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls that share a key.
+
+    The first caller for a key starts the work; callers arriving while it is
+    in flight await the same task instead of starting their own. The shared
+    task is shielded so one caller being cancelled does not cancel it for
+    the others.
+    """
+
+    def __init__(self, max_tracked_keys: int = 1024):
+        self._inflight: dict = {}
+        self._per_key: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._max_tracked_keys = max_tracked_keys
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+            self._record_coalesced(key)
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def _record_coalesced(self, key: Hashable) -> None:
+        self._per_key[key] = self._per_key.get(key, 0) + 1
+        self._per_key.move_to_end(key)
+        while len(self._per_key) > self._max_tracked_keys:
+            self._per_key.popitem(last=False)
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self, top: int = 10) -> dict:
+        busiest = sorted(self._per_key.items(), key=lambda item: item[1], reverse=True)[:top]
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "top_coalesced_keys": [{"key": key, "coalesced": count} for key, count in busiest],
+        }
@@ -0,0 +1,131 @@
+# app/core/sql_profiler.py
+"""
+Per-request SQL profiling.
+
+Cursor events on every engine count statements and DB time for the current
+request, log slow statements with the shape (never the values) of their
+bound parameters, and flag statements repeated often enough in one request
+to suggest an N+1 lazy-load pattern. In dev the totals are also sent back in
+a ``Server-Timing`` header so they show up in the browser's network panel.
+"""
+
+from collections import Counter as ShapeCounter
+from contextvars import ContextVar
+from typing import Optional
+import logging
+import time
+
+from prometheus_client import Counter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import DB_QUERY_SECONDS, UNMATCHED_ROUTE
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_FLAGGED = Counter(
+    "db_n_plus_one_total",
+    "Requests in which one statement shape repeated past the N+1 threshold",
+    ["route"],
+)
+
+class QueryProfile:
+    """SQL statements run while serving one request."""
+
+    __slots__ = ("count", "seconds", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        # Statement text is already parameterised, so it is the query's shape
+        self.shapes = ShapeCounter()
+
+    def repeated(self, threshold: int) -> list:
+        """(statement, count) for shapes run at least ``threshold`` times."""
+        return [(statement, n) for statement, n in self.shapes.most_common() if n >= threshold]
+
+# Current request's profile; a mutable object so statements run in
+# threadpool workers (a copy of the request context) are counted too.
+request_profile: ContextVar[Optional[QueryProfile]] = ContextVar("request_profile", default=None)
+
+def parameter_shape(parameters, executemany: bool = False):
+    """Types of the bound parameters, e.g. ``{'email_1': 'str'}``; never the values."""
+    if executemany and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    DB_QUERY_SECONDS.observe(elapsed)
+
+    profile = request_profile.get()
+    if profile is not None:
+        profile.count += 1
+        profile.seconds += elapsed
+        profile.shapes[statement] += 1
+
+    if elapsed * 1000 >= settings.sql_slow_query_ms:
+        logger.warning(
+            "Slow query (%.1f ms): %s | params %s",
+            elapsed * 1000, " ".join(statement.split()), parameter_shape(parameters, executemany),
+        )
+
+def server_timing_enabled() -> bool:
+    if settings.sql_server_timing is not None:
+        return settings.sql_server_timing
+    return settings.app_env == "dev"
+
+class SQLProfilerMiddleware:
+    """
+    Profiles each HTTP request's SQL; the profile is left in
+    ``scope["sql_profile"]`` for outer middleware such as metrics.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.server_timing = server_timing_enabled()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        scope["sql_profile"] = profile
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                total_ms = (time.perf_counter() - started) * 1000
+                timing = f'db;dur={profile.seconds * 1000:.2f};desc="{profile.count} queries", app;dur={total_ms:.2f}'
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timing.encode()),
+                    # Lets the cross-origin dev frontend read the timings
+                    (b"timing-allow-origin", b"*"),
+                ]
+            await send(message)
+
+        token = request_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_profile.reset(token)
+            repeated = profile.repeated(settings.sql_n_plus_one_threshold)
+            if repeated:
+                template = getattr(scope.get("route"), "path", None)
+                N_PLUS_ONE_FLAGGED.labels(template or UNMATCHED_ROUTE).inc()
+                for statement, count in repeated:
+                    logger.warning(
+                        "Possible N+1 in %s %s: same statement ran %d times: %s",
+                        scope["method"], template or scope["path"], count, " ".join(statement.split())[:500],
+                    )
@@ -0,0 +1,49 @@
+# app/core/startup.py
+"""
+Startup phase timings.
+
+Each phase of booting a worker (module imports, schema check, warm-ups) is
+timed and logged as one line once the app is ready, and kept for
+``GET /health`` so slow cold starts can be traced to the phase responsible.
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Wall-clock seconds per named startup phase, in the order they ran."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.ready_seconds: Optional[float] = None
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def ready(self) -> None:
+        """Mark startup complete and log the breakdown."""
+        self.ready_seconds = sum(self.phases.values())
+        breakdown = " ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in self.phases.items())
+        logger.info("Startup ready in %.0fms: %s", self.ready_seconds * 1000, breakdown)
+
+    def snapshot(self) -> dict:
+        return {
+            "ready_ms": round(self.ready_seconds * 1000, 1) if self.ready_seconds is not None else None,
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+        }
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,134 @@
+# app/core/static_files.py
+"""
+Static file responses that caches and CDNs can keep.
+
+Every file gets a strong ETag derived from its content. Files whose name is
+a content hash (stored avatars and their thumbnails) never change under
+their URL, so they are marked ``immutable`` for a year; anything else must
+be revalidated, which costs a 304 and no body when it hasn't changed.
+Range requests are served by Starlette's ``FileResponse``; ``If-Range`` is
+checked against the same ETag.
+"""
+
+from collections import OrderedDict
+from email.utils import parsedate
+from typing import Optional
+import hashlib
+import os
+import re
+import stat
+import threading
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# <sha256>.<ext>, or <sha256>_<size>.<ext> for a thumbnail
+_HASHED_NAME = re.compile(r"^[0-9a-f]{64}(?:_\d+)?\.[0-9a-z]+$")
+
+
+def is_hashed(path) -> bool:
+    """Whether ``path``'s file name is a content hash, i.e. it never changes."""
+    return _HASHED_NAME.match(os.path.basename(path)) is not None
+
+
+class ContentETags:
+    """
+    Strong ETags for files, by content.
+
+    Hashed file names are their own ETag (extension included, as the WebP
+    and JPEG thumbnails of one avatar share a hash). Other files are hashed once and
+    the result kept per (path, size, mtime), so a replaced file gets a new
+    ETag while an unchanged one is never read twice.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._etags: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, stat_result: os.stat_result) -> str:
+        if is_hashed(path):
+            return f'"{os.path.basename(path)}"'
+        key = (str(path), stat_result.st_size, stat_result.st_mtime_ns)
+        with self._lock:
+            etag = self._etags.get(key)
+            if etag is not None:
+                self._etags.move_to_end(key)
+                return etag
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()}"'
+        with self._lock:
+            self._etags[key] = etag
+            while len(self._etags) > self.maxsize:
+                self._etags.popitem(last=False)
+        return etag
+
+
+etags = ContentETags()
+
+
+def not_modified(request_headers: Headers, response_headers: Headers) -> bool:
+    """
+    Whether a 304 may replace a full response (RFC 9110 section 13.2.2).
+
+    ``If-None-Match`` takes precedence: when present, ``If-Modified-Since``
+    is ignored, so a changed file is never answered 304 on its date alone.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison, as GET/HEAD validation calls for
+        return "*" in tags or response_headers["etag"] in [tag.removeprefix("W/") for tag in tags]
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = response_headers.get("last-modified")
+    if if_modified_since is None or last_modified is None:
+        return False
+    since, modified = parsedate(if_modified_since), parsedate(last_modified)
+    return since is not None and modified is not None and since >= modified
+
+
+def file_response(
+    path,
+    stat_result: os.stat_result,
+    request_headers: Headers,
+    status_code: int = 200,
+    headers: Optional[dict] = None,
+    media_type: Optional[str] = None,
+) -> Response:
+    """A ``FileResponse`` with a content ETag and cache policy, or a 304."""
+    response = FileResponse(
+        path,
+        status_code=status_code,
+        stat_result=stat_result,
+        media_type=media_type,
+        headers={
+            "etag": etags.get(path, stat_result),
+            "cache-control": IMMUTABLE if is_hashed(path) else REVALIDATE,
+            **(headers or {}),
+        },
+    )
+    if status_code == 200 and not_modified(request_headers, response.headers):
+        return NotModifiedResponse(response.headers)
+    return response
+
+
+class HashedStaticFiles(StaticFiles):
+    """``StaticFiles`` serving content ETags and immutable caching for hashed names."""
+
+    def lookup_path(self, path: str):
+        # Runs on a worker thread: hash here so the event loop never reads files
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+            etags.get(full_path, stat_result)
+        return full_path, stat_result
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        return file_response(full_path, stat_result, Headers(scope=scope), status_code)
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from app.models.payment import Payment
 from app.schemas.payment import PaymentCreate
+from app.core.pagination import clamp_limit
+from app.crud.payment import get_payments_page
 
 def create_payment(db: Session, user_id: int, payment: PaymentCreate, status: str, reference: str):
     db_payment = Payment(
@@ -15,8 +17,8 @@ def create_payment(db: Session, user_id: int, payment: PaymentCreate, status: st
     db.refresh(db_payment)
     return db_payment
 
-def get_user_payments(db: Session, user_id: int):
-    return db.query(Payment).filter(Payment.user_id == user_id).order_by(Payment.created_at.desc()).all()
+def get_user_payments(db: Session, user_id: int, limit: int = None, cursor: str = None):
+    return get_payments_page(db, clamp_limit(limit), cursor=cursor, user_id=user_id)[0]
 
-def get_all_payments(db: Session):
-    return db.query(Payment).order_by(Payment.created_at.desc()).all()
+def get_all_payments(db: Session, limit: int = None, cursor: str = None):
+    return get_payments_page(db, clamp_limit(limit), cursor=cursor)[0]
@@ -1,25 +1,87 @@
 # app/crud/payment.py
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.pagination import keyset_page, keyset_page_async
 from app.models.payment import Payment
 from app.schemas.payment import PaymentCreate
 from random import choice
 
-def create_payment(db: Session, user_id: int, payment_in: PaymentCreate):
+def _simulated_payment(user_id: int, payment_in: PaymentCreate, tenant_id=None) -> Payment:
     # Simulate payment: random success/failure
     status = choice(["success", "failed"])
     reference = f"MOCK-{user_id}-{payment_in.method[:2].upper()}-{payment_in.amount:.2f}"
-    payment = Payment(
+    return Payment(
+        tenant_id=tenant_id,
         user_id=user_id,
         amount=payment_in.amount,
         method=payment_in.method,
         status=status,
         reference=reference
     )
+
+def create_payment(db: Session, user_id: int, payment_in: PaymentCreate, tenant_id=None):
+    payment = _simulated_payment(user_id, payment_in, tenant_id)
     db.add(payment)
     db.commit()
     db.refresh(payment)
     return payment
 
-def get_payments_by_user(db: Session, user_id: int):
-    return db.query(Payment).filter(Payment.user_id == user_id).order_by(Payment.created_at.desc()).all()
+async def create_payment_async(db: AsyncSession, user_id: int, payment_in: PaymentCreate, tenant_id=None):
+    payment = _simulated_payment(user_id, payment_in, tenant_id)
+    db.add(payment)
+    await db.commit()
+    await db.refresh(payment)
+    return payment
+
+def get_payments_page(
+    db: Session,
+    limit: int,
+    cursor: str = None,
+    user_id: int = None,
+    tenant_id=None,
+    status: str = None,
+    method: str = None,
+    date_from=None,
+    date_to=None,
+):
+    """
+    Newest payments first, one keyset page at a time.
+
+    Scoped by ``user_id`` (``ix_payments_user_created``) and/or ``tenant_id``
+    (``ix_payments_tenant_created``); ``date_from`` is inclusive and
+    ``date_to`` exclusive. Returns the payments and the next page's cursor.
+    """
+    query = _filter_payments(db.query(Payment), user_id, tenant_id, status, method, date_from, date_to)
+    return keyset_page(query, Payment.created_at, Payment.id, cursor, limit)
+
+async def get_payments_page_async(
+    db: AsyncSession,
+    limit: int,
+    cursor: str = None,
+    user_id: int = None,
+    tenant_id=None,
+    status: str = None,
+    method: str = None,
+    date_from=None,
+    date_to=None,
+):
+    """``get_payments_page`` for an ``AsyncSession``"""
+    stmt = _filter_payments(select(Payment), user_id, tenant_id, status, method, date_from, date_to)
+    return await keyset_page_async(db, stmt, Payment.created_at, Payment.id, cursor, limit)
+
+def _filter_payments(query, user_id, tenant_id, status, method, date_from, date_to):
+    if user_id is not None:
+        query = query.filter(Payment.user_id == user_id)
+    if tenant_id is not None:
+        query = query.filter(Payment.tenant_id == tenant_id)
+    if status:
+        query = query.filter(Payment.status == status)
+    if method:
+        query = query.filter(Payment.method == method)
+    if date_from is not None:
+        query = query.filter(Payment.created_at >= date_from)
+    if date_to is not None:
+        query = query.filter(Payment.created_at < date_to)
+    return query
@@ -1,23 +1,20 @@
 from sqlalchemy.orm import Session
+from app.core.pagination import keyset_page
 from app.models.user import User
-from app.models.tenant import Tenant
 from app.schemas.user import UserCreate
 from app.core.security import get_password_hash
+from app.core.principal import invalidate_principal
+from app.services.tenant_registry import tenant_registry
+
+def create_user(db: Session, user_in: UserCreate, hashed_password: str = None):
+    # Get or create default tenant (cached after the first lookup)
+    default_tenant = tenant_registry.get_or_create_default(db)
 
-def create_user(db: Session, user_in: UserCreate):
-    # Get or create default tenant
-    default_tenant = db.query(Tenant).filter(Tenant.name == "default").first()
-    if not default_tenant:
-        default_tenant = Tenant(name="default", status="active")
-        db.add(default_tenant)
-        db.commit()
-        db.refresh(default_tenant)
-    
     user = User(
         tenant_id=default_tenant.id,  # Add tenant_id
         full_name=user_in.full_name,
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password or get_password_hash(user_in.password),
         plan_type=user_in.plan_type,
         status=user_in.status,
         role=user_in.role or "user",
@@ -35,12 +32,34 @@ def create_user(db: Session, user_in: UserCreate):
 def get_users(db: Session):
     return db.query(User).all()
 
+def get_users_page(
+    db: Session,
+    limit: int,
+    cursor: str = None,
+    status: str = None,
+    role: str = None,
+    plan_type: str = None,
+    tenant_id=None,
+):
+    """Newest users first, filtered, one keyset page at a time"""
+    query = db.query(User)
+    if tenant_id is not None:
+        query = query.filter(User.tenant_id == tenant_id)
+    if status:
+        query = query.filter(User.status == status)
+    if role:
+        query = query.filter(User.role == role)
+    if plan_type:
+        query = query.filter(User.plan_type == plan_type)
+    return keyset_page(query, User.created_at, User.id, cursor, limit)
+
 def update_user_status(db: Session, user_id: int, new_status: str):
     user = db.query(User).filter(User.id == user_id).first()
     if user:
         user.status = new_status
         db.commit()
         db.refresh(user)
+        invalidate_principal(user.email)
     return user
 
 def update_user_role(db: Session, user_id: int, new_role: str):
@@ -49,4 +68,5 @@ def update_user_role(db: Session, user_id: int, new_role: str):
         user.role = new_role
         db.commit()
         db.refresh(user)
+        invalidate_principal(user.email)
     return user
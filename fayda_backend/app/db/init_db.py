@@ -1,10 +1,95 @@
+from datetime import datetime
+from pathlib import Path
+import re
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
 from app.db.session import engine
 from app.db.base import User, Payment  # import so both models are registered
 from app.db.base_class import Base
+from app.services.tenant_registry import tenant_registry
+
+# created_at given to rows from before it was tracked, so they sort oldest
+UNKNOWN_CREATED_AT = datetime(1970, 1, 1)
+
+VERSIONS_DIR = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+
+_REVISION_RE = re.compile(r"^(down_revision|revision)\b[^=]*=\s*(.+)$", re.MULTILINE)
+_ID_RE = re.compile(r"['\"]([0-9A-Za-z_]+)['\"]")
+
+
+class SchemaRevisionError(RuntimeError):
+    """Raised at startup when the database is not at the expected migration."""
+
 
 def init():
     Base.metadata.create_all(bind=engine)
+    backfill_created_at()
+    ensure_default_tenant()
     print("✅ Tables created successfully.")
 
+def backfill_created_at(bind=engine) -> int:
+    """
+    Fill NULL ``created_at`` on keyset-paginated tables with
+    ``UNKNOWN_CREATED_AT``; Alembic does this in migration, but dev databases
+    created before the column was NOT NULL keep their old schema. Returns
+    the number of rows updated.
+    """
+    updated = 0
+    with bind.begin() as connection:
+        for table in (User.__table__, Payment.__table__):
+            result = connection.execute(
+                table.update().where(table.c.created_at.is_(None)).values(created_at=UNKNOWN_CREATED_AT)
+            )
+            updated += result.rowcount
+    return updated
+
+def ensure_default_tenant(bind=engine) -> None:
+    """
+    Create the default tenant if missing. Alembic's multi-tenancy migration
+    inserts it; dev databases built with ``create_all`` get it here, so
+    request handlers only ever read it.
+    """
+    with Session(bind) as db:
+        tenant_registry.get_or_create_default(db)
+
+def head_revisions(versions_dir: Path = VERSIONS_DIR) -> set:
+    """
+    Head revision ids of the Alembic migration graph.
+
+    Read straight from the ``revision`` / ``down_revision`` lines of the
+    migration files, so the check needs neither Alembic nor importing them.
+    """
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        for name, value in _REVISION_RE.findall(path.read_text(encoding="utf-8")):
+            ids = _ID_RE.findall(value)
+            (revisions if name == "revision" else parents).update(ids)
+    return revisions - parents
+
+def check_revision(bind=engine) -> str:
+    """
+    Fail fast unless the database is at the expected migration.
+
+    One query against ``alembic_version``; the expected revision is
+    ``DB_EXPECTED_REVISION`` when set, otherwise the head of the migration
+    files shipped with this build.
+    """
+    expected = {settings.db_expected_revision} if settings.db_expected_revision else head_revisions()
+    try:
+        with bind.connect() as connection:
+            current = set(connection.execute(text("SELECT version_num FROM alembic_version")).scalars())
+    except DBAPIError as exc:
+        raise SchemaRevisionError("Database has no alembic_version table; run `alembic upgrade head`") from exc
+    if current != expected:
+        raise SchemaRevisionError(
+            f"Database is at revision {sorted(current) or 'none'}, expected {sorted(expected)}; "
+            "run `alembic upgrade head`"
+        )
+    return ", ".join(sorted(current))
+
 if __name__ == "__main__":
     init()
@@ -0,0 +1,120 @@
+# app/db/pool.py
+
+from typing import Optional
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Checkout wait buckets in seconds (upper bounds, cumulative like Prometheus)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class PoolMetrics:
+    """
+    Counters and a checkout-wait histogram for one connection pool.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)  # last one is +Inf
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            index = next((i for i, bound in enumerate(WAIT_BUCKETS) if seconds <= bound), len(WAIT_BUCKETS))
+            self.wait_buckets[index] += 1
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, hits in zip(WAIT_BUCKETS + ("+Inf",), self.wait_buckets):
+                cumulative += hits
+                buckets[str(bound)] = cumulative
+            return {
+                "size": pool.size() if pool is not None else None,
+                "checked_out": pool.checkedout() if pool is not None else None,
+                "checked_in": pool.checkedin() if pool is not None else None,
+                # QueuePool reports unopened base capacity as negative overflow
+                "overflow": max(pool.overflow(), 0) if pool is not None else None,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+                "wait_seconds": {
+                    "count": self.wait_count,
+                    "sum": round(self.wait_sum, 6),
+                    "max": round(self.wait_max, 6),
+                    "buckets": buckets,
+                },
+            }
+
+class _TimedCheckout:
+    """Pool mixin that times how long each checkout waits for a connection."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.count("timeouts")
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+# Metrics of every instrumented engine, by name ("sync", "async", ...)
+pool_metrics = {}
+
+def instrument_pool(engine, name: str) -> PoolMetrics:
+    """Attach ``PoolMetrics`` to ``engine``'s pool and count pool events."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    metrics = PoolMetrics(name)
+    metrics.pool = sync_engine.pool
+    sync_engine.pool.metrics = metrics
+
+    event.listen(sync_engine, "connect", lambda *args: metrics.count("connects"))
+    event.listen(sync_engine, "checkout", lambda *args: metrics.count("checkouts"))
+    event.listen(sync_engine, "invalidate", lambda *args: metrics.count("invalidations"))
+    event.listen(sync_engine, "soft_invalidate", lambda *args: metrics.count("soft_invalidations"))
+
+    pool_metrics[name] = metrics
+    return metrics
+
+def pool_stats() -> dict:
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
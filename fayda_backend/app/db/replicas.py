@@ -0,0 +1,201 @@
+# app/db/replicas.py
+"""
+Read-replica routing.
+
+Sessions from ``ReadSessionLocal`` / ``AsyncReadSessionLocal`` (dependencies
+``get_read_db`` / ``get_async_read_db``) send plain SELECTs to a healthy
+replica from ``DATABASE_REPLICA_URLS`` and everything else to the primary.
+Replicas are assigned round-robin per session, not per statement: all reads
+of a session see one replica's state, however far it lags. Once anything is
+written during a request - in this session or any other - later reads in
+that request go to the primary too, so callers always read their own
+writes, and a session whose replica is marked unhealthy reads from the
+primary from then on. With no replicas configured every read goes to the
+primary.
+"""
+
+from contextvars import ContextVar
+from typing import List, Optional
+import asyncio
+import itertools
+import logging
+import threading
+
+from sqlalchemy import Delete, Insert, Update, create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.pool import instrument_pool
+from app.db.session import TenantSession, async_database_url, async_engine, engine, engine_options
+
+logger = logging.getLogger(__name__)
+
+# Per-request write marker; a mutable dict so writes made in threadpool
+# workers (which run in a copy of the request context) are seen here too.
+request_writes: ContextVar[Optional[dict]] = ContextVar("request_writes", default=None)
+
+class Replica:
+    def __init__(self, index: int, url: str):
+        self.name = f"replica-{index}"
+        self.engine = create_engine(url, **engine_options(url))
+        async_url = async_database_url(url)
+        self.async_engine = create_async_engine(async_url, **engine_options(async_url, is_async=True))
+        if hasattr(self.engine.pool, "metrics"):
+            instrument_pool(self.engine, self.name)
+            instrument_pool(self.async_engine, f"{self.name}-async")
+        self.healthy = True
+        self.failures = 0
+
+class ReplicaSet:
+    """
+    Round-robin over healthy replicas.
+
+    A replica is taken out of rotation when a query on it hits a connection
+    error or a health probe fails, and put back by the next successful probe.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(index, url) for index, url in enumerate(urls)]
+        self._order = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._lock = threading.Lock()
+        for replica in self.replicas:
+            event.listen(replica.engine, "handle_error", self._on_error(replica))
+            event.listen(replica.async_engine.sync_engine, "handle_error", self._on_error(replica))
+
+    def _on_error(self, replica: Replica):
+        def handle_error(context):
+            if context.is_disconnect or context.connection is None:
+                self.mark(replica, healthy=False)
+        return handle_error
+
+    def mark(self, replica: Replica, healthy: bool) -> None:
+        if replica.healthy and not healthy:
+            logger.warning("Read replica %s marked unhealthy; reads fall back to the primary", replica.name)
+        replica.healthy = healthy
+        replica.failures = 0 if healthy else replica.failures + 1
+
+    def pick(self) -> Optional[Replica]:
+        """Next healthy replica, or ``None`` to use the primary."""
+        if not self.replicas:
+            return None
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = self.replicas[next(self._order)]
+                if replica.healthy:
+                    return replica
+        return None
+
+    async def probe(self) -> None:
+        for replica in self.replicas:
+            try:
+                async with replica.async_engine.connect() as conn:
+                    await asyncio.wait_for(conn.execute(text("SELECT 1")), settings.db_replica_check_seconds)
+                self.mark(replica, healthy=True)
+            except Exception:
+                self.mark(replica, healthy=False)
+
+    async def check_forever(self) -> None:
+        """Probe every replica each ``db_replica_check_seconds``."""
+        while True:
+            await asyncio.sleep(settings.db_replica_check_seconds)
+            await self.probe()
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            replica.engine.dispose()
+            await replica.async_engine.dispose()
+
+    def stats(self) -> list:
+        return [{"name": r.name, "healthy": r.healthy, "failures": r.failures} for r in self.replicas]
+
+replica_set = ReplicaSet(settings.database_replica_urls)
+
+def note_write(session) -> None:
+    session.info["wrote"] = True
+    writes = request_writes.get()
+    if writes is not None:
+        writes["wrote"] = True
+
+@event.listens_for(TenantSession, "after_flush")
+def _after_flush(session, flush_context):
+    note_write(session)
+
+@event.listens_for(TenantSession, "do_orm_execute")
+def _on_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        note_write(orm_execute_state.session)
+
+def _needs_primary(session, clause) -> bool:
+    if session._flushing or session.info.get("wrote"):
+        return True
+    writes = request_writes.get()
+    if writes is not None and writes["wrote"]:
+        return True
+    if isinstance(clause, (Insert, Update, Delete)):
+        return True
+    return getattr(clause, "_for_update_arg", None) is not None
+
+def _session_replica(session) -> Optional[Replica]:
+    """The replica ``session`` reads from: picked on its first read, then kept."""
+    if "replica" not in session.info:
+        session.info["replica"] = replica_set.pick()
+    replica = session.info["replica"]
+    if replica is not None and not replica.healthy:
+        # Not another replica: it may lag differently from the one already read
+        session.info["replica"] = replica = None
+    return replica
+
+class RoutingSession(TenantSession):
+    """Sends reads to the session's replica unless the primary is required"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not _needs_primary(self, clause):
+            replica = _session_replica(self)
+            if replica is not None:
+                return replica.engine
+        return engine
+
+class AsyncRoutingSession(TenantSession):
+    """``RoutingSession`` for ``AsyncSession``: binds are the engines' sync facades"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not _needs_primary(self, clause):
+            replica = _session_replica(self)
+            if replica is not None:
+                return replica.async_engine.sync_engine
+        return async_engine.sync_engine
+
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+AsyncReadSessionLocal = async_sessionmaker(
+    sync_session_class=AsyncRoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+class ReadYourWritesMiddleware:
+    """Gives each HTTP request its own write marker (see ``request_writes``)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = request_writes.set({"wrote": False})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_writes.reset(token)
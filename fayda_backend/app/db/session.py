@@ -1,25 +1,74 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_pool
 import os
+import uuid
 
 # Use DATABASE_URL from environment or fallback to SQLite
 DATABASE_URL = os.getenv("DATABASE_URL", settings.database_url)
 
-# Configure engine based on database type
-if DATABASE_URL.startswith("postgresql"):
-    engine = create_engine(
-        DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=300,
-    )
-else:
-    # SQLite fallback
-    engine = create_engine(
-        DATABASE_URL, connect_args={"check_same_thread": False}
-    )
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """Pool sizing and driver options from ``Settings`` for ``url``"""
+    connect_args = {}
+    if url.startswith("sqlite"):
+        if not is_async:
+            connect_args["check_same_thread"] = False
+        if url in ("sqlite://", "sqlite+aiosqlite://") or ":memory:" in url:
+            # In-memory databases keep SQLAlchemy's single-connection pool
+            return {"connect_args": connect_args}
+    elif settings.db_pgbouncer:
+        # Transaction pooling hands each transaction a different server
+        # connection, so named prepared statements cannot be reused
+        if is_async:
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+        else:
+            connect_args["prepare_threshold"] = None
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+if isinstance(engine.pool, InstrumentedQueuePool):
+    instrument_pool(engine, "sync")
+
+def async_database_url(url: str) -> str:
+    """Same database through an asyncio driver: asyncpg or aiosqlite"""
+    if url.startswith("postgresql"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite://" + url.split("://", 1)[1]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True))
+if isinstance(async_engine.pool, InstrumentedAsyncQueuePool):
+    instrument_pool(async_engine, "async")
+
+class TenantSession(Session):
+    """Session that binds ``info["tenant_id"]`` at every transaction begin"""
+
+SessionLocal = sessionmaker(class_=TenantSession, autocommit=False, autoflush=False, bind=engine)
+
+# Async twin for routes that should not occupy a threadpool worker while
+# waiting on the database. Objects stay usable after commit (no lazy reloads).
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    sync_session_class=TenantSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 def get_db():
     db = SessionLocal()
@@ -28,11 +77,46 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+TENANT_GUC_SQL = text("SELECT set_config('app.current_tenant', :tid, true)")
+
+def _apply_tenant_guc(connection, tenant_id: str):
+    if connection.dialect.name == "postgresql":
+        connection.execute(TENANT_GUC_SQL, {"tid": tenant_id})
+
+@event.listens_for(TenantSession, "after_begin")
+def bind_tenant_on_begin(session, transaction, connection):
+    """
+    Bind the session's tenant as the first statement of every transaction.
+
+    ``set_config(..., true)`` is transaction-local like ``SET LOCAL``, so the
+    RLS policies (``current_setting('app.current_tenant', true)``) see it for
+    the whole transaction, it never leaks to the next pooled connection user,
+    and it is re-applied automatically after each commit.
+    """
+    tenant_id = session.info.get("tenant_id")
+    if tenant_id is not None:
+        _apply_tenant_guc(connection, tenant_id)
+
+def get_tenant_session(tenant_id: str) -> Session:
+    """Session whose transactions are all scoped to ``tenant_id``"""
+    return SessionLocal(info={"tenant_id": str(tenant_id)})
+
 def set_tenant_context(db, tenant_id: str):
     """Set the current tenant context for RLS policies"""
-    if DATABASE_URL.startswith("postgresql"):
-        db.execute(text("SET LOCAL app.current_tenant = :tid"), {"tid": tenant_id})
-        db.commit()
+    db.info["tenant_id"] = str(tenant_id)
+    if db.in_transaction():
+        # Already past BEGIN: bind now, inside the open transaction (no commit)
+        _apply_tenant_guc(db.connection(), str(tenant_id))
+
+async def set_async_tenant_context(db: AsyncSession, tenant_id: str):
+    """``set_tenant_context`` for an ``AsyncSession``"""
+    db.info["tenant_id"] = str(tenant_id)
+    if db.in_transaction() and db.get_bind().dialect.name == "postgresql":
+        await db.execute(TENANT_GUC_SQL, {"tid": str(tenant_id)})
 
 # Run as a Module from the Project Root
 # From your project root (C:\Users\lijma\Documents\GitHub\fayda-id-checker\fayda_backend), run:
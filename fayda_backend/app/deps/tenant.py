@@ -1,39 +1,62 @@
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from jose import JWTError, jwt
-from app.core.config import settings
-from app.db.session import get_db, set_tenant_context
-from app.models.user import User
-from app.models.tenant import Tenant
-from typing import Optional
+from app.auth.deps import get_token_claims
+from app.auth.jwt import TokenClaims
+from app.core.principal import load_principal_async
+from app.db.session import get_db, get_async_db, set_tenant_context
+from app.services.tenant_registry import tenant_registry, TenantInfo
 import uuid
 
 async def get_current_tenant_id(
-    db: Session = Depends(get_db),
-    token: str = Depends(lambda: None)  # This will be overridden by auth dependency
-) -> Optional[uuid.UUID]:
+    claims: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_async_db),
+) -> uuid.UUID:
     """
-    Extract tenant_id from JWT token or user record.
-    For now, we'll use a default tenant for existing users.
+    Resolve the caller's tenant from the ``tenant_id`` token claim.
+
+    Tokens issued before the claim existed fall back to the caller's cached
+    principal, then to the default tenant; a subject that no longer exists
+    is rejected with 401. With warm caches this needs no queries, and it
+    never writes; the tenant's status comes from the registry.
     """
-    # TODO: Extract tenant_id from JWT token when implemented
-    # For now, return default tenant ID
-    default_tenant = db.query(Tenant).filter(Tenant.name == "default").first()
-    if not default_tenant:
-        # Create default tenant if it doesn't exist
-        default_tenant = Tenant(name="default", status="active")
-        db.add(default_tenant)
-        db.commit()
-        db.refresh(default_tenant)
-    
-    return default_tenant.id
+    tenant = None
+    if claims.tenant_id:
+        try:
+            tenant = await tenant_registry.get_async(db, uuid.UUID(claims.tenant_id))
+        except ValueError:
+            tenant = None
+    else:
+        principal = await load_principal_async(db, claims.sub)
+        if principal is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token or expired session",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if principal.tenant_id is not None:
+            tenant = await tenant_registry.get_async(db, principal.tenant_id)
+        else:
+            tenant = await tenant_registry.get_default_async(db)
+
+    if tenant is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tenant not found"
+        )
+    if not tenant.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Tenant is not active"
+        )
+    return tenant.id
 
 async def get_current_tenant(
     tenant_id: uuid.UUID = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db)
-) -> Tenant:
-    """Get the current tenant object"""
-    tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+    db: AsyncSession = Depends(get_async_db)
+) -> TenantInfo:
+    """Get the current tenant (from the registry, normally without a query)"""
+    tenant = await tenant_registry.get_async(db, tenant_id)
     if not tenant:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
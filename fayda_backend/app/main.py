@@ -1,15 +1,33 @@
+import time
+_imports_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
 
 from app.api.routes import api_router
 from app.mocks.mock_id_api import mock_id_router
-from app.api.endpoints.user import router as user_router
+from app.api.endpoints.user import router as user_router, AVATAR_PATH
 
 # Ensure SQLAlchemy models are imported for Alembic (do NOT remove)
 import app.db.base
-from app.db.init_db import init as init_db
+from app.db.init_db import init as init_db, check_revision
+from app.services.fayda_client import fayda_client
+from app.services.id_cache import sweep_expired_forever
+from app.services.avatar_store import collect_orphans_forever
+from app.services.avatar_variants import avatar_variants
+from app.services.password_service import password_hasher
+from app.db.replicas import replica_set, ReadYourWritesMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.sql_profiler import SQLProfilerMiddleware
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.core.static_files import HashedStaticFiles
+from app.core.config import settings
+from app.core.startup import startup_timer
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 
@@ -17,10 +35,62 @@ app = FastAPI()
 
 @app.on_event("startup")
 def startup_event():
-    # Ensure database tables exist
-    init_db()
+    if settings.startup_mode == "production":
+        # Schema is managed by Alembic: one query, no DDL round trips
+        with startup_timer.phase("db_check"):
+            logger.info("Database at revision %s", check_revision())
+    else:
+        # Ensure database tables exist
+        with startup_timer.phase("db_create_all"):
+            init_db()
     os.makedirs(os.path.join(BASE_DIR, "static"), exist_ok=True)
 
+@app.on_event("startup")
+async def start_fayda_client():
+    # One pooled upstream client per worker process. In production it is
+    # opened after startup so TLS/HTTP2 setup doesn't delay readiness; an
+    # ID check arriving first opens it itself.
+    app.state.fayda_warmup = None
+    if settings.startup_mode == "production":
+        app.state.fayda_warmup = asyncio.create_task(fayda_client.warm_up())
+    else:
+        with startup_timer.phase("fayda_client"):
+            await fayda_client.startup()
+    app.state.id_cache_sweeper = asyncio.create_task(sweep_expired_forever())
+
+@app.on_event("startup")
+async def start_replica_checks():
+    app.state.replica_checker = None
+    if replica_set.replicas:
+        with startup_timer.phase("replica_probe"):
+            await replica_set.probe()
+        app.state.replica_checker = asyncio.create_task(replica_set.check_forever())
+
+@app.on_event("startup")
+async def start_avatar_gc():
+    app.state.avatar_gc = asyncio.create_task(collect_orphans_forever())
+
+@app.on_event("startup")
+def report_startup():
+    # Registered last, so every phase above has been recorded
+    startup_timer.ready()
+
+@app.on_event("shutdown")
+async def stop_fayda_client():
+    app.state.id_cache_sweeper.cancel()
+    app.state.avatar_gc.cancel()
+    if app.state.replica_checker is not None:
+        app.state.replica_checker.cancel()
+    await replica_set.dispose()
+    if app.state.fayda_warmup is not None:
+        await app.state.fayda_warmup
+    await fayda_client.shutdown()
+
+@app.on_event("shutdown")
+def stop_process_pools():
+    password_hasher.shutdown()
+    avatar_variants.shutdown()
+
 # --- CORS setup ---
 # Read allowed origins from environment variable, or use sensible defaults
 allowed_origins = os.getenv(
@@ -29,18 +99,36 @@ allowed_origins = os.getenv(
 )
 allowed_origins = [origin.strip() for origin in allowed_origins.split(",") if origin.strip()]
 
+# Refuse oversized uploads before the multipart parser spools them to disk
+# (the allowance covers multipart boundaries and part headers)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={AVATAR_PATH: settings.avatar_max_bytes + 64 * 1024},
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Link"],
 )
 
-# Serve user uploaded files
+# Per-request write tracking so replica reads never miss the request's own writes
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Per-request SQL counts, N+1 and slow-query logging, Server-Timing in dev
+app.add_middleware(SQLProfilerMiddleware)
+
+# Outermost, so request timings include every other middleware
+app.add_middleware(MetricsMiddleware)
+
+# Serve user uploaded files: content-hashed names are cached as immutable,
+# everything else revalidates against a content ETag
 app.mount(
     "/static",
-    StaticFiles(directory=os.path.join(BASE_DIR, "static")),
+    HashedStaticFiles(directory=os.path.join(BASE_DIR, "static")),
     name="static",
 )
 
@@ -48,3 +136,5 @@ app.mount(
 app.include_router(api_router)
 app.include_router(mock_id_router, prefix="/id")
 app.include_router(user_router)
+
+startup_timer.record("imports", time.perf_counter() - _imports_started)
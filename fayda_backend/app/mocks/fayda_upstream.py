@@ -0,0 +1,161 @@
+# app/mocks/fayda_upstream.py
+"""
+Local stand-in for the Fayda ID API (``GET /api/check/{id_number}``).
+
+Serves a large deterministic synthetic dataset with programmable latency,
+error and timeout behaviour so the ID-check path (client, cache, breaker)
+can be exercised under slow-dependency load without the real API.
+
+Run it with::
+
+    python -m app.mocks.fayda_upstream --port 9100 --latency lognormal --latency-ms 80 --p99-ms 900
+
+and point the backend at it with ``FAYDA_USE_LOCAL_STUB=true``. Behaviour can
+be changed while it runs through ``GET``/``PUT /api/stub/config``.
+"""
+
+from typing import Literal, Optional
+import argparse
+import asyncio
+import hashlib
+import math
+import random
+
+from fastapi import FastAPI, HTTPException, Response
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings
+
+from app.mocks.mock_id_api import VALID_IDS
+
+FIRST_SYNTHETIC_ID = 100000000
+
+FIRST_NAMES = ["Abebe", "Selam", "Dawit", "Hana", "Tesfaye", "Meron", "Yonas", "Liya", "Bereket", "Saba"]
+LAST_NAMES = ["Kebede", "Tesfaye", "Girma", "Alemu", "Haile", "Bekele", "Tadesse", "Mengistu", "Wolde", "Assefa"]
+
+
+class StubConfig(BaseModel):
+    latency: Literal["none", "fixed", "uniform", "lognormal", "exponential"] = "fixed"
+    latency_ms: float = 50.0       # fixed value, lognormal median or exponential mean
+    latency_min_ms: float = 10.0   # uniform lower bound
+    latency_max_ms: float = 200.0  # uniform upper bound
+    p99_ms: float = 500.0          # lognormal 99th percentile
+    error_rate: float = 0.0        # share of requests answered with 503
+    timeout_rate: float = 0.0      # share of requests that hang for timeout_seconds
+    timeout_seconds: float = 30.0
+    dataset_size: int = 1_000_000  # synthetic IDs FIRST_SYNTHETIC_ID .. + dataset_size - 1
+    seed: Optional[int] = None
+
+
+class StubSettings(StubConfig, BaseSettings):
+    class Config:
+        env_prefix = "FAYDA_STUB_"
+
+
+config = StubConfig(**StubSettings().model_dump())
+rng = random.Random(config.seed)
+
+app = FastAPI(title="Fayda API stand-in")
+
+
+def sample_latency(cfg: StubConfig) -> float:
+    """Return a delay in seconds drawn from the configured distribution."""
+    if cfg.latency == "none":
+        return 0.0
+    if cfg.latency == "fixed":
+        millis = cfg.latency_ms
+    elif cfg.latency == "uniform":
+        millis = rng.uniform(cfg.latency_min_ms, cfg.latency_max_ms)
+    elif cfg.latency == "exponential":
+        millis = rng.expovariate(1.0 / cfg.latency_ms) if cfg.latency_ms > 0 else 0.0
+    else:
+        # Log-normal fitted to the median and p99 (z(0.99) ~= 2.326)
+        mu = math.log(max(cfg.latency_ms, 0.001))
+        sigma = max(math.log(max(cfg.p99_ms, cfg.latency_ms) / max(cfg.latency_ms, 0.001)) / 2.326, 0.0)
+        millis = rng.lognormvariate(mu, sigma)
+    return max(millis, 0.0) / 1000.0
+
+
+def lookup(id_number: str, cfg: StubConfig) -> Optional[dict]:
+    """Find a record in the fixed test IDs or the synthetic dataset."""
+    if id_number in VALID_IDS:
+        data = VALID_IDS[id_number]
+        return {"name": data["name"], "dob": data["dob"], "photo_url": data["photo"]}
+    if not id_number.isdigit():
+        return None
+    offset = int(id_number) - FIRST_SYNTHETIC_ID
+    if not 0 <= offset < cfg.dataset_size:
+        return None
+
+    digest = hashlib.sha256(id_number.encode()).digest()
+    year = 1950 + digest[2] % 55
+    month = 1 + digest[3] % 12
+    day = 1 + digest[4] % 28
+    gender = "men" if digest[5] % 2 else "women"
+    return {
+        "name": f"{FIRST_NAMES[digest[0] % len(FIRST_NAMES)]} {LAST_NAMES[digest[1] % len(LAST_NAMES)]}",
+        "dob": f"{year:04d}-{month:02d}-{day:02d}",
+        "photo_url": f"https://randomuser.me/api/portraits/{gender}/{digest[6] % 100}.jpg",
+    }
+
+
+@app.get("/api/check/{id_number}")
+async def check(id_number: str):
+    cfg = config
+    roll = rng.random()
+    if roll < cfg.timeout_rate:
+        await asyncio.sleep(cfg.timeout_seconds)
+        return Response(status_code=504)
+
+    await asyncio.sleep(sample_latency(cfg))
+    if roll < cfg.timeout_rate + cfg.error_rate:
+        raise HTTPException(status_code=503, detail="Injected upstream error")
+
+    record = lookup(id_number, cfg)
+    if record is None:
+        raise HTTPException(status_code=404, detail="ID not found")
+    return record
+
+
+@app.get("/api/stub/config", response_model=StubConfig)
+def get_config():
+    return config
+
+
+@app.put("/api/stub/config", response_model=StubConfig)
+def update_config(new_config: StubConfig):
+    """Swap the stub's behaviour at runtime, e.g. to simulate an outage mid-run."""
+    global config, rng
+    config = new_config
+    if new_config.seed is not None:
+        rng = random.Random(new_config.seed)
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local Fayda API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", choices=["none", "fixed", "uniform", "lognormal", "exponential"])
+    parser.add_argument("--latency-ms", type=float)
+    parser.add_argument("--latency-min-ms", type=float)
+    parser.add_argument("--latency-max-ms", type=float)
+    parser.add_argument("--p99-ms", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--timeout-rate", type=float)
+    parser.add_argument("--timeout-seconds", type=float)
+    parser.add_argument("--dataset-size", type=int)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    overrides = {
+        key: value for key, value in vars(args).items()
+        if key not in ("host", "port") and value is not None
+    }
+    update_config(config.model_copy(update=overrides))
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
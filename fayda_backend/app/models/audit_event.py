@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, BigInteger
+from sqlalchemy import Column, String, DateTime, ForeignKey, BigInteger, Integer
 from sqlalchemy.dialects.postgresql import UUID, INET
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
@@ -7,13 +7,14 @@ import datetime
 class AuditEvent(Base):
     __tablename__ = "audit_event"
     
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # INTEGER on SQLite so the dev fallback gets a rowid alias and autoincrement
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False, index=True)
     actor_id = Column(UUID(as_uuid=True), nullable=True, index=True)
     action = Column(String, nullable=False)
     target_type = Column(String, nullable=False)
     target_id = Column(String, nullable=False)
-    ip = Column(INET, nullable=True)
+    ip = Column(String().with_variant(INET, "postgresql"), nullable=True)
     user_agent = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     
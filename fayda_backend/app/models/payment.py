@@ -1,5 +1,5 @@
 # app/models/payment.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base_class import Base
@@ -7,6 +7,11 @@ import datetime
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        # Keyset pagination of payment history on (created_at, id)
+        Index("ix_payments_user_created", "user_id", "created_at", "id"),
+        Index("ix_payments_tenant_created", "tenant_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -14,7 +19,7 @@ class Payment(Base):
     amount = Column(Float)
     status = Column(String)
     reference = Column(String)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="payments")
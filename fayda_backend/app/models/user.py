@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.db.base_class import Base
@@ -6,6 +6,11 @@ import datetime
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination of GET /admin/users on (created_at, id)
+        Index("ix_users_tenant_created", "tenant_id", "created_at", "id"),
+        Index("ix_users_created", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenant.id"), nullable=False, index=True)
     full_name = Column(String, nullable=False)
@@ -16,7 +21,7 @@ class User(Base):
     plan_type = Column(String, default="basic")
     phone = Column(String, nullable=True)       # NEW
     company = Column(String, nullable=True)     # NEW
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
     last_login = Column(DateTime, nullable=True)
 
     notes = Column(String, nullable=True)  
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal
+
+from app.core.config import settings
+
+# Duplicates are allowed in the request (the distinct-ID cap is enforced
+# after dedupe), but never more than twice the cap of raw entries is parsed
+MAX_BATCH_ITEMS = 2 * settings.fayda_batch_max_ids
+
+class BatchCheckRequest(BaseModel):
+    """
+    IDs to verify in one call. Duplicates are checked once.
+    """
+    id_numbers: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS, example=["123456789", "987654321"])
+    order: Literal["input", "completion"] = Field(
+        default="input",
+        description="Stream results in input order or as each check completes",
+    )
@@ -1,38 +1,59 @@
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from app.models.user import User
+from app.core.security import get_password_hash, verify_password as _verify_password
 from app.auth.jwt import create_access_token
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services.password_service import password_hasher
+from app.services.tenant_registry import tenant_registry
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_password_hash(password)
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return _verify_password(plain, hashed)
+
+def token_claims(user: User) -> dict:
+    return {
+        "sub": user.email,
+        "role": user.role,
+        "tenant_id": str(user.tenant_id) if user.tenant_id else None,
+    }
+
+def save_rehashed_password(db: Session, user: User, new_hash: str) -> None:
+    """Persist a hash upgraded to the current bcrypt cost during login."""
+    user.hashed_password = new_hash
+    db.commit()
 
-def register_user(db: Session, user_data):
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+async def register_user(db: Session, user_data):
+    existing_user = await run_in_threadpool(lambda: db.query(User).filter(User.email == user_data.email).first())
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_pw = hash_password(user_data.password)
+    hashed_pw = await password_hasher.hash(user_data.password)
     user = User(email=user_data.email, hashed_password=hashed_pw)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
 
-    token = create_access_token(data={"sub": user.email, "role": user.role})
+    def save():
+        user.tenant_id = tenant_registry.get_or_create_default(db).id
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+
+    await run_in_threadpool(save)
+
+    token = create_access_token(data=token_claims(user))
     return {"access_token": token}
 
-def login_user(db: Session, credentials: dict):
-    user = db.query(User).filter(User.email == credentials["username"]).first()
+async def login_user(db: Session, credentials: dict):
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == credentials["username"]).first())
     if not user:
         raise HTTPException(status_code=401, detail="Email not found")
 
-    if not verify_password(credentials["password"], user.hashed_password):
+    valid, new_hash = await password_hasher.verify_and_update(credentials["password"], user.hashed_password)
+    if not valid:
         raise HTTPException(status_code=401, detail="Incorrect password")
+    if new_hash:
+        await run_in_threadpool(save_rehashed_password, db, user, new_hash)
 
-    token = create_access_token(data={"sub": user.email, "role": user.role})
+    token = create_access_token(data=token_claims(user))
     return {"access_token": token}
@@ -0,0 +1,199 @@
+# app/services/avatar_store.py
+
+from pathlib import Path
+from typing import Iterable, Optional
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+import uuid
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parents[2] / "static"
+AVATAR_URL_PREFIX = "/static/avatars/"
+CHUNK_SIZE = 64 * 1024
+TEMP_SUFFIX = ".part"
+VARIANTS_DIRNAME = "variants"
+
+# Leading bytes of each accepted image format; the stored extension comes
+# from these, never from the client's filename or Content-Type
+_MAGIC = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+SNIFF_BYTES = 12
+
+_STORED_NAME = re.compile(r"^[0-9a-f]{64}\.(jpg|png|gif|webp)$")
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """File extension for the image format ``head`` starts with, if accepted."""
+    for magic, ext in _MAGIC:
+        if head.startswith(magic):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+class AvatarStore:
+    """
+    Content-addressed avatar files under ``static/avatars``.
+
+    Uploads are streamed in chunks to a temporary file while being hashed,
+    then renamed to ``<sha256>.<ext>``, so identical images are stored once
+    and a stored file never changes. Files no user references any more are
+    removed by ``collect_orphans`` once they are older than the grace
+    period, which leaves time for the upload that wrote them to commit.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def stored_path(self, name: str) -> Optional[Path]:
+        """Path of the stored avatar ``name``, or ``None`` if there is no such file."""
+        if not _STORED_NAME.match(name):
+            return None
+        path = self.directory / name
+        return path if path.is_file() else None
+
+    def path_for_url(self, url: str) -> Optional[Path]:
+        """Stored file behind an ``avatar_url``, if it is one of ours."""
+        if not url or not url.startswith(AVATAR_URL_PREFIX):
+            return None
+        return self.stored_path(url[len(AVATAR_URL_PREFIX):])
+
+    async def save(self, upload: UploadFile) -> str:
+        """
+        Store ``upload`` and return its URL.
+
+        Raises 400 unless the content is a supported image and 413 as soon
+        as it grows past ``max_bytes``; nothing is left behind either way.
+        """
+        await run_in_threadpool(self.directory.mkdir, parents=True, exist_ok=True)
+        temp = self.directory / f".{uuid.uuid4().hex}{TEMP_SUFFIX}"
+        digest = hashlib.sha256()
+        size = 0
+        ext = None
+        handle = await run_in_threadpool(open, temp, "wb")
+        try:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if ext is None:
+                    ext = sniff_image_type(chunk[:SNIFF_BYTES])
+                    if ext is None:
+                        raise HTTPException(status_code=400, detail="Invalid file type.")
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Avatar larger than {self.max_bytes} bytes")
+                digest.update(chunk)
+                await run_in_threadpool(handle.write, chunk)
+            if ext is None:
+                raise HTTPException(status_code=400, detail="Invalid file type.")
+            await run_in_threadpool(handle.close)
+            name = f"{digest.hexdigest()}.{ext}"
+            await run_in_threadpool(self._commit, temp, self.directory / name)
+        except BaseException:
+            await run_in_threadpool(self._discard, handle, temp)
+            raise
+        return AVATAR_URL_PREFIX + name
+
+    @staticmethod
+    def _commit(temp: Path, final: Path) -> None:
+        try:
+            # Already stored: keep the existing file but restart its grace
+            # period, so a concurrent GC can't remove it before we commit
+            os.utime(final)
+        except FileNotFoundError:
+            os.replace(temp, final)
+        else:
+            temp.unlink()
+
+    @staticmethod
+    def _discard(handle, temp: Path) -> None:
+        handle.close()
+        temp.unlink(missing_ok=True)
+
+    def collect_orphans(self, referenced: Iterable[str], grace_seconds: float) -> int:
+        """
+        Delete files in the avatar directory that no URL in ``referenced``
+        points at and that haven't been written or reused for
+        ``grace_seconds``, then the variants of avatars no longer stored.
+        Returns how many files were removed.
+        """
+        if not self.directory.is_dir():
+            return 0
+        keep = {url[len(AVATAR_URL_PREFIX):] for url in referenced if url and url.startswith(AVATAR_URL_PREFIX)}
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.name in keep:
+                continue
+            if entry.name.startswith(".") and not entry.name.endswith(TEMP_SUFFIX):
+                continue
+            try:
+                if entry.stat().st_mtime > cutoff:
+                    continue
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+        return removed + self._collect_variants(cutoff)
+
+    def _collect_variants(self, cutoff: float) -> int:
+        variants = self.directory / VARIANTS_DIRNAME
+        if not variants.is_dir():
+            return 0
+        stored = {name.split(".", 1)[0] for name in os.listdir(self.directory)}
+        removed = 0
+        for entry in os.scandir(variants):
+            # Variants are named <sha256>_<size>.<ext>; leftovers of crashed
+            # renders match no stored avatar and go once old enough
+            if not entry.is_file() or entry.name.split("_", 1)[0] in stored:
+                continue
+            try:
+                if entry.stat().st_mtime > cutoff:
+                    continue
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+        return removed
+
+    async def collect_orphans_async(self, grace_seconds: float) -> int:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(User.avatar_url).where(User.avatar_url.is_not(None)).distinct())
+            referenced = set(result.scalars())
+        return await run_in_threadpool(self.collect_orphans, referenced, grace_seconds)
+
+
+avatar_store = AvatarStore(STATIC_DIR / "avatars", max_bytes=settings.avatar_max_bytes)
+
+
+async def collect_orphans_forever() -> None:
+    """Periodically remove avatar files no user references any more."""
+    while True:
+        await asyncio.sleep(settings.avatar_gc_interval_seconds)
+        try:
+            removed = await avatar_store.collect_orphans_async(settings.avatar_gc_grace_seconds)
+        except Exception:
+            logger.exception("Avatar garbage collection failed")
+            continue
+        if removed:
+            logger.info("Removed %d orphaned avatar files", removed)
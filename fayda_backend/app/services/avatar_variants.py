@@ -0,0 +1,151 @@
+# app/services/avatar_variants.py
+
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List
+import asyncio
+import logging
+import os
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.process_pool import ProcessPool
+from app.core.singleflight import SingleFlight
+from app.services.avatar_store import TEMP_SUFFIX, VARIANTS_DIRNAME, avatar_store
+
+logger = logging.getLogger(__name__)
+
+# Output format -> (file extension, media type)
+FORMATS = {"webp": ("webp", "image/webp"), "jpeg": ("jpg", "image/jpeg")}
+
+# A few KB of PNG can declare a gigapixel canvas; refuse to decode those
+MAX_SOURCE_PIXELS = 40_000_000
+
+
+class AvatarVariantError(Exception):
+    """Raised when a stored avatar cannot be decoded or resized."""
+
+
+def _render_variant(source: str, target: str, size: int, fmt: str, quality: int) -> None:
+    # Imported here: only the worker processes need Pillow
+    from PIL import Image, ImageOps
+
+    try:
+        opened = Image.open(source)
+    except Image.DecompressionBombError as exc:
+        raise ValueError(str(exc)) from exc
+    with opened as image:
+        if image.width * image.height > MAX_SOURCE_PIXELS:
+            raise ValueError(f"{image.width}x{image.height} image is too large to resize")
+        # Let the JPEG decoder downscale while decoding, far cheaper than
+        # decoding a multi-megapixel photo at full size
+        image.draft("RGB", (size * 2, size * 2))
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        if fmt == "jpeg" and has_alpha:
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        # Written under a temp name and renamed, so readers never see a partial file
+        temp = os.path.join(os.path.dirname(target), f".{uuid.uuid4().hex}{TEMP_SUFFIX}")
+        try:
+            image.save(temp, format=fmt.upper(), quality=quality)
+            os.replace(temp, target)
+        except BaseException:
+            if os.path.exists(temp):
+                os.unlink(temp)
+            raise
+
+
+class AvatarVariants:
+    """
+    Square WebP/JPEG thumbnails of stored avatars, cached on disk.
+
+    Variants live next to the avatars as ``variants/<sha256>_<size>.<ext>``;
+    avatars never change, so a variant once written is valid for good. A
+    missing one is rendered on first request in a pool of ``workers``
+    processes (``0`` renders in the threadpool instead), and concurrent
+    requests for the same variant share one render. A render whose worker
+    dies (say, out of memory on a crafted image) is retried once on a fresh
+    pool and then reported as an ``AvatarVariantError``.
+    """
+
+    def __init__(self, directory: Path, sizes: List[int], workers: int, quality: int):
+        self.directory = Path(directory)
+        self.sizes = sorted(sizes)
+        self.workers = workers
+        self.quality = quality
+        self._pool = ProcessPool(workers, name="avatar variant pool")
+        self._renders = SingleFlight()
+        self.hits = 0
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+
+    def pick_size(self, requested: int) -> int:
+        """Smallest configured size that covers ``requested``, else the largest."""
+        for size in self.sizes:
+            if size >= requested:
+                return size
+        return self.sizes[-1]
+
+    def path_for(self, source: Path, size: int, fmt: str) -> Path:
+        ext, _ = FORMATS[fmt]
+        return self.directory / f"{source.stem}_{size}.{ext}"
+
+    async def get(self, source: Path, size: int, fmt: str) -> Path:
+        """Path of the ``size``/``fmt`` variant of ``source``, rendering it if needed."""
+        target = self.path_for(source, size, fmt)
+        if target.exists():
+            self.hits += 1
+            return target
+        await self._renders.do(target.name, lambda: self._render(source, target, size, fmt))
+        return target
+
+    async def _render(self, source: Path, target: Path, size: int, fmt: str) -> None:
+        await run_in_threadpool(self.directory.mkdir, parents=True, exist_ok=True)
+        args = (str(source), str(target), size, fmt, self.quality)
+        try:
+            if self.workers > 0:
+                await self._pool.run(_render_variant, *args)
+            else:
+                await run_in_threadpool(_render_variant, *args)
+        except BrokenProcessPool as exc:
+            raise AvatarVariantError(f"Cannot resize {source.name}: worker died") from exc
+        except (OSError, ValueError) as exc:
+            # Pillow raises these (UnidentifiedImageError is an OSError) for
+            # files that pass the magic-byte check but don't decode
+            raise AvatarVariantError(f"Cannot resize {source.name}: {exc}") from exc
+
+    async def pregenerate(self, source: Path) -> None:
+        """Render every size and format of a freshly uploaded avatar."""
+        results = await asyncio.gather(
+            *(self.get(source, size, fmt) for size in self.sizes for fmt in FORMATS),
+            return_exceptions=True,
+        )
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            logger.warning("Avatar variants for %s failed: %s", source.name, failures[0])
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pool_restarts": self._pool.restarts,
+            "sizes": self.sizes,
+            "hits": self.hits,
+            "renders": self._renders.executions,
+            "coalesced": self._renders.coalesced,
+            "in_flight": self._renders.in_flight(),
+        }
+
+
+avatar_variants = AvatarVariants(
+    avatar_store.directory / VARIANTS_DIRNAME,
+    sizes=settings.avatar_variant_sizes,
+    workers=settings.avatar_variant_workers,
+    quality=settings.avatar_variant_quality,
+)
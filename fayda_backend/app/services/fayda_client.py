@@ -0,0 +1,154 @@
+# app/services/fayda_client.py
+
+from typing import TYPE_CHECKING, Optional
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import settings
+from app.core.metrics import FAYDA_UPSTREAM_SECONDS
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class FaydaUpstreamError(Exception):
+    """Raised when the Fayda API cannot give a definitive answer."""
+
+
+class FaydaCircuitOpenError(FaydaUpstreamError):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+
+class FaydaClient:
+    """
+    Process-wide async client for the Fayda ID API.
+
+    One ``httpx.AsyncClient`` is shared by every request so connections are
+    pooled and kept alive instead of being re-opened per lookup. Call
+    ``startup()``/``shutdown()`` from the application lifecycle hooks; a
+    lookup that arrives before ``startup()`` opens the client itself, so
+    startup may warm it in the background instead of blocking on it.
+
+    Calls go through a circuit breaker: while the upstream is failing or
+    too slow, lookups fail fast with ``FaydaCircuitOpenError`` so callers
+    can fall back immediately instead of waiting for timeouts.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        token: Optional[str] = None,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ):
+        self.base_url = (base_url or settings.fayda_base_url).rstrip("/")
+        self.token = token or settings.fayda_api_token
+        self._transport = transport
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._open_lock = threading.Lock()
+        self.breaker = CircuitBreaker(
+            "fayda",
+            failure_rate_threshold=settings.fayda_breaker_failure_rate,
+            slow_call_rate_threshold=settings.fayda_breaker_slow_call_rate,
+            slow_call_seconds=settings.fayda_breaker_slow_call_seconds,
+            window_size=settings.fayda_breaker_window_size,
+            min_calls=settings.fayda_breaker_min_calls,
+            open_seconds=settings.fayda_breaker_open_seconds,
+            half_open_max_calls=settings.fayda_breaker_half_open_calls,
+        )
+
+    async def startup(self) -> None:
+        self._open()
+
+    async def warm_up(self) -> None:
+        """Open the client on a worker thread, keeping the event loop free."""
+        await run_in_threadpool(self._open)
+
+    def _open(self) -> "httpx.AsyncClient":
+        if self._client is not None:
+            return self._client
+        with self._open_lock:
+            if self._client is None:
+                self._client = self._build()
+        return self._client
+
+    def _build(self) -> "httpx.AsyncClient":
+        # httpx, h2 and the TLS context are the bulk of this client's cost
+        import httpx
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.token}"},
+            http2=settings.fayda_http2,
+            transport=self._transport,
+            timeout=httpx.Timeout(
+                connect=settings.fayda_connect_timeout,
+                read=settings.fayda_read_timeout,
+                write=settings.fayda_read_timeout,
+                pool=settings.fayda_pool_timeout,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.fayda_max_connections,
+                max_keepalive_connections=settings.fayda_max_keepalive_connections,
+                keepalive_expiry=settings.fayda_keepalive_expiry,
+            ),
+        )
+
+    async def shutdown(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        return self._open()
+
+    async def check_id(self, id_number: str) -> Optional[dict]:
+        """
+        Look up an ID number upstream.
+
+        Returns the upstream record when found, ``None`` when Fayda reports
+        the ID as unknown, and raises ``FaydaUpstreamError`` on transport
+        errors, server-side failures or while the breaker is open.
+        """
+        generation = self.breaker.admit()
+        if generation is None:
+            FAYDA_UPSTREAM_SECONDS.labels("circuit_open").observe(0)
+            raise FaydaCircuitOpenError("Fayda circuit breaker is open")
+
+        started = time.monotonic()
+        try:
+            result = await self._request(id_number)
+        except FaydaUpstreamError:
+            elapsed = time.monotonic() - started
+            self.breaker.record_failure(elapsed, generation)
+            FAYDA_UPSTREAM_SECONDS.labels("error").observe(elapsed)
+            raise
+        except BaseException:
+            # Cancelled mid-call: no outcome, but free any probe slot
+            self.breaker.release(generation)
+            raise
+        elapsed = time.monotonic() - started
+        self.breaker.record_success(elapsed, generation)
+        FAYDA_UPSTREAM_SECONDS.labels("found" if result is not None else "not_found").observe(elapsed)
+        return result
+
+    async def _request(self, id_number: str) -> Optional[dict]:
+        import httpx
+        try:
+            response = await self.client.get(f"/check/{id_number}")
+        except httpx.HTTPError as exc:
+            raise FaydaUpstreamError(str(exc)) from exc
+
+        if response.status_code == 200:
+            try:
+                return response.json()
+            except ValueError as exc:
+                raise FaydaUpstreamError("Fayda API returned invalid JSON") from exc
+        if response.status_code >= 500 or response.status_code == 429:
+            raise FaydaUpstreamError(f"Fayda API returned {response.status_code}")
+        return None
+
+
+fayda_client = FaydaClient()
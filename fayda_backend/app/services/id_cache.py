@@ -0,0 +1,46 @@
+# app/services/id_cache.py
+
+from typing import Optional
+import asyncio
+import hashlib
+import hmac
+import secrets
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Per-process key: cache keys can't be reversed into ID numbers by hashing
+# the (small) ID space, and nothing derived from it survives a restart.
+_KEY_SECRET = secrets.token_bytes(32)
+
+id_cache = TTLCache(
+    maxsize=settings.fayda_cache_max_entries,
+    ttl=settings.fayda_cache_ttl_seconds,
+)
+
+def cache_key(id_number: str) -> str:
+    return hmac.new(_KEY_SECRET, id_number.encode(), hashlib.sha256).hexdigest()
+
+def get_cached_result(id_number: str) -> Optional[dict]:
+    if not settings.fayda_cache_enabled:
+        return None
+    return id_cache.get(cache_key(id_number))
+
+def cache_result(id_number: str, result: dict) -> None:
+    """Store an upstream answer; "not found" answers get the shorter negative TTL."""
+    if not settings.fayda_cache_enabled:
+        return
+    ttl = settings.fayda_cache_ttl_seconds if result["valid"] else settings.fayda_cache_negative_ttl_seconds
+    id_cache.set(cache_key(id_number), result, ttl=ttl)
+
+def wants_cache_bypass(fayda_cache: Optional[str], cache_control: Optional[str]) -> bool:
+    """Honour ``X-Fayda-Cache: bypass`` and ``Cache-Control: no-cache``."""
+    if fayda_cache and fayda_cache.strip().lower() == "bypass":
+        return True
+    return bool(cache_control and "no-cache" in cache_control.lower())
+
+async def sweep_expired_forever() -> None:
+    """Purge expired entries so cached PII never outlives its TTL."""
+    while True:
+        await asyncio.sleep(settings.fayda_cache_sweep_seconds)
+        id_cache.purge_expired()
@@ -0,0 +1,129 @@
+# app/services/password_service.py
+
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Tuple
+import time
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_REJECTED, PASSWORD_HASH_SECONDS
+from app.core.process_pool import ProcessPool
+
+
+def _hash_in_worker(password: str) -> str:
+    from app.core.security import get_password_hash
+    return get_password_hash(password)
+
+
+def _verify_in_worker(plain: str, hashed: str) -> bool:
+    from app.core.security import verify_password
+    return verify_password(plain, hashed)
+
+
+def _verify_and_update_in_worker(plain: str, hashed: str):
+    from app.core.security import verify_and_update_password
+    return verify_and_update_password(plain, hashed)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hash/verify off the event loop in a bounded process pool.
+
+    bcrypt is deliberately CPU-heavy and holds the GIL in-process, so a
+    burst of logins would otherwise stall every other route. Work is sent
+    to ``workers`` processes (``0`` runs it in the threadpool instead) and
+    at most ``max_pending`` operations may be queued or running; beyond that
+    callers get a 503 rather than an ever-growing queue. A pool whose worker
+    died is replaced and the call retried once; if that fails too the caller
+    gets the same 503.
+    """
+
+    def __init__(self, workers: int, max_pending: int, latency_window: int = 512):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool = ProcessPool(workers, name="password hashing pool")
+        self._latencies: deque = deque(maxlen=latency_window)
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+
+    _operations = {
+        _hash_in_worker: "hash",
+        _verify_in_worker: "verify",
+        _verify_and_update_in_worker: "verify",
+    }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+
+    @staticmethod
+    def _busy() -> HTTPException:
+        return HTTPException(
+            status_code=503,
+            detail="Authentication service busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    async def _run(self, fn: Callable, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            PASSWORD_HASH_REJECTED.inc()
+            raise self._busy()
+
+        self.pending += 1
+        started = time.perf_counter()
+        try:
+            if self.workers > 0:
+                try:
+                    return await self._pool.run(fn, *args)
+                except BrokenProcessPool:
+                    raise self._busy()
+            return await run_in_threadpool(fn, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.pending -= 1
+            self.completed += 1
+            self.total_seconds += elapsed
+            self._latencies.append(elapsed)
+            PASSWORD_HASH_SECONDS.labels(self._operations[fn]).observe(elapsed)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash_in_worker, password)
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._run(_verify_in_worker, plain, hashed)
+
+    async def verify_and_update(self, plain: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Verify and, if the stored cost is outdated, also return a fresh hash."""
+        return await self._run(_verify_and_update_in_worker, plain, hashed)
+
+    def stats(self) -> dict:
+        recent = sorted(self._latencies)
+
+        def pct(p: float) -> float:
+            if not recent:
+                return 0.0
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))] * 1000, 2)
+
+        return {
+            "workers": self.workers,
+            "queue_depth": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "pool_restarts": self._pool.restarts,
+            "avg_ms": round(self.total_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
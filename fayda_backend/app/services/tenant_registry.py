@@ -0,0 +1,119 @@
+# app/services/tenant_registry.py
+
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import uuid
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.tenant import Tenant
+
+DEFAULT_TENANT_NAME = "default"
+
+@dataclass(frozen=True)
+class TenantInfo:
+    """
+    Snapshot of a tenant row, safe to share between requests.
+    """
+    id: uuid.UUID
+    name: str
+    status: str
+
+    @property
+    def is_active(self) -> bool:
+        return self.status == "active"
+
+class TenantRegistry:
+    """
+    In-process tenant lookup by id and by name.
+
+    Entries are refreshed from the database on a miss and expire after
+    ``tenant_cache_ttl_seconds`` so status changes (e.g. suspensions)
+    propagate without a restart; call ``invalidate`` after changing a
+    tenant in this process.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        self._by_id = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._by_name = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _remember(self, tenant: Tenant) -> TenantInfo:
+        info = TenantInfo(id=tenant.id, name=tenant.name, status=tenant.status)
+        self._by_id.set(info.id, info)
+        self._by_name.set(info.name, info)
+        return info
+
+    def get(self, db: Session, tenant_id: uuid.UUID) -> Optional[TenantInfo]:
+        info = self._by_id.get(tenant_id)
+        if info is not None:
+            return info
+        tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+        return self._remember(tenant) if tenant else None
+
+    async def get_async(self, db: AsyncSession, tenant_id: uuid.UUID) -> Optional[TenantInfo]:
+        info = self._by_id.get(tenant_id)
+        if info is not None:
+            return info
+        tenant = (await db.execute(select(Tenant).where(Tenant.id == tenant_id))).scalar_one_or_none()
+        return self._remember(tenant) if tenant else None
+
+    def get_by_name(self, db: Session, name: str) -> Optional[TenantInfo]:
+        info = self._by_name.get(name)
+        if info is not None:
+            return info
+        tenant = db.query(Tenant).filter(Tenant.name == name).first()
+        return self._remember(tenant) if tenant else None
+
+    def get_or_create_default(self, db: Session) -> TenantInfo:
+        info = self.get_by_name(db, DEFAULT_TENANT_NAME)
+        if info is not None:
+            return info
+        tenant = Tenant(name=DEFAULT_TENANT_NAME, status="active")
+        db.add(tenant)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker created it first
+            db.rollback()
+            tenant = db.query(Tenant).filter(Tenant.name == DEFAULT_TENANT_NAME).one()
+        return self._remember(tenant)
+
+    async def get_by_name_async(self, db: AsyncSession, name: str) -> Optional[TenantInfo]:
+        info = self._by_name.get(name)
+        if info is not None:
+            return info
+        tenant = (await db.execute(select(Tenant).where(Tenant.name == name))).scalar_one_or_none()
+        return self._remember(tenant) if tenant else None
+
+    async def get_default_async(self, db: AsyncSession) -> Optional[TenantInfo]:
+        """
+        The default tenant, read-only: it is created by the multi-tenancy
+        migration (or ``init_db`` in dev), never on the request path.
+        """
+        return await self.get_by_name_async(db, DEFAULT_TENANT_NAME)
+
+    def invalidate(self, tenant_id: Optional[uuid.UUID] = None, name: Optional[str] = None) -> None:
+        if tenant_id is not None:
+            info = self._by_id.pop(tenant_id)
+            if info is not None:
+                self._by_name.pop(info.name)
+        if name is not None:
+            info = self._by_name.pop(name)
+            if info is not None:
+                self._by_id.pop(info.id)
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._by_name.clear()
+
+    def stats(self) -> dict:
+        return self._by_id.stats()
+
+tenant_registry = TenantRegistry(
+    ttl=settings.tenant_cache_ttl_seconds,
+    maxsize=settings.tenant_cache_max_entries,
+)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+bcrypt Cost Calibration
+
+Measures how long one bcrypt hash takes on this host at each cost factor and
+picks the highest cost whose median hash time fits the latency budget. The
+result is written as BCRYPT_ROUNDS to the env file that Settings reads, so
+every node type gets predictable login latency. Existing users are moved to
+the new cost transparently on their next successful login.
+
+Usage:
+    python scripts/calibrate_bcrypt.py --target-ms 250
+    python scripts/calibrate_bcrypt.py --target-ms 250 --env-file .env --write
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import bcrypt
+
+# Below 10 is too weak to store passwords; above 16 is impractical per login
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def measure(rounds: int, samples: int) -> float:
+    """Median seconds for one bcrypt hash at ``rounds``."""
+    timings = []
+    for _ in range(samples):
+        salt = bcrypt.gensalt(rounds=rounds)
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", salt)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, samples: int):
+    """Return the highest cost within budget, or ``None`` if none fits."""
+    chosen = None
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        elapsed_ms = measure(rounds, samples) * 1000
+        fits = elapsed_ms <= target_ms
+        print(f"  cost {rounds:2d}: {elapsed_ms:8.1f} ms {'✅' if fits else '❌'}")
+        if not fits:
+            break
+        chosen = rounds
+    return chosen
+
+
+def write_env(env_file: Path, rounds: int) -> None:
+    """Set BCRYPT_ROUNDS in ``env_file``, replacing an existing value."""
+    lines = env_file.read_text().splitlines() if env_file.exists() else []
+    line = f"BCRYPT_ROUNDS={rounds}"
+    for index, existing in enumerate(lines):
+        if existing.strip().startswith("BCRYPT_ROUNDS="):
+            lines[index] = line
+            break
+    else:
+        if lines:
+            lines.append("")
+        lines += ["# bcrypt cost calibrated by scripts/calibrate_bcrypt.py", line]
+    env_file.write_text("\n".join(lines) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the bcrypt cost for this host")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Latency budget for one hash")
+    parser.add_argument("--samples", type=int, default=5, help="Hashes measured per cost")
+    parser.add_argument("--env-file", default=str(project_root / ".env"))
+    parser.add_argument("--write", action="store_true", help="Write BCRYPT_ROUNDS to --env-file")
+    args = parser.parse_args()
+
+    print(f"Calibrating bcrypt for a {args.target_ms:.0f} ms budget...")
+    rounds = calibrate(args.target_ms, args.samples)
+    if rounds is None:
+        rounds = MIN_ROUNDS
+        print(f"⚠️  Even cost {MIN_ROUNDS} exceeds the budget; not going lower than that")
+    print(f"\nRecommended cost: BCRYPT_ROUNDS={rounds}")
+
+    if args.write:
+        write_env(Path(args.env_file), rounds)
+        print(f"Wrote BCRYPT_ROUNDS={rounds} to {args.env_file}")
+
+
+if __name__ == "__main__":
+    main()
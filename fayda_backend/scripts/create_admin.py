@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Create Admin Script
+
+Creates an active admin user in the default tenant, straight through the
+database; the public registration endpoint is not used. Does nothing if a
+user with the email already exists.
+
+Usage:
+    python scripts/create_admin.py admin@example.com --password secret123
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.crud import user as crud_user
+from app.db.session import SessionLocal
+from app.db.base import User  # import so every model is registered
+from app.schemas.user import UserCreate
+
+def create_admin(email: str, password: str, full_name: str = "Admin User") -> User:
+    """Create the admin ``email`` unless it exists, and return the user"""
+    db = SessionLocal()
+    try:
+        existing = db.query(User).filter(User.email == email).first()
+        if existing:
+            print(f"User already exists: {email}")
+            return existing
+        admin = crud_user.create_user(db, UserCreate(
+            email=email,
+            full_name=full_name,
+            password=password,
+            role="admin",
+            status="active",
+            plan_type="premium",
+        ))
+        print(f"Created admin user: {admin.email}")
+        return admin
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Create an admin user directly in the database")
+    parser.add_argument("email")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--full-name", default="Admin User")
+    args = parser.parse_args()
+    create_admin(args.email, args.password, args.full_name)
+
+if __name__ == "__main__":
+    main()
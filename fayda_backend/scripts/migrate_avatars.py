@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Legacy Avatar Migration
+
+Moves avatars uploaded before content-addressed storage (stored as
+static/avatars/{id}_{filename} and overwritten in place) to
+static/avatars/<sha256>.<ext>, and points avatar_url at the new file so it
+is served as immutable. The old files are left for the orphan GC.
+
+Usage:
+    python scripts/migrate_avatars.py --dry-run
+    python scripts/migrate_avatars.py
+"""
+
+import argparse
+import hashlib
+import shutil
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.avatar_store import AVATAR_URL_PREFIX, SNIFF_BYTES, avatar_store, sniff_image_type
+
+
+def content_address(path: Path):
+    """``<sha256>.<ext>`` for an image file, or ``None`` if it isn't one."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        ext = sniff_image_type(f.read(SNIFF_BYTES))
+        f.seek(0)
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return f"{digest.hexdigest()}.{ext}" if ext else None
+
+
+def migrate(dry_run: bool) -> None:
+    db = SessionLocal()
+    moved = skipped = 0
+    try:
+        users = db.query(User).filter(User.avatar_url.like(AVATAR_URL_PREFIX + "%")).all()
+        for user in users:
+            if avatar_store.path_for_url(user.avatar_url) is not None:
+                continue
+            legacy = avatar_store.directory / user.avatar_url[len(AVATAR_URL_PREFIX):]
+            name = content_address(legacy) if legacy.is_file() else None
+            if name is None:
+                print(f"⚠️  {user.email}: {user.avatar_url} is missing or not an image, left as is")
+                skipped += 1
+                continue
+            print(f"  {user.email}: {user.avatar_url} -> {AVATAR_URL_PREFIX}{name}")
+            if not dry_run:
+                target = avatar_store.directory / name
+                if not target.exists():
+                    shutil.copyfile(legacy, target)
+                user.avatar_url = AVATAR_URL_PREFIX + name
+                db.commit()
+            moved += 1
+    finally:
+        db.close()
+    verb = "Would migrate" if dry_run else "Migrated"
+    print(f"✅ {verb} {moved} avatars ({skipped} skipped)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move legacy avatars to content-addressed storage")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args()
+    migrate(args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
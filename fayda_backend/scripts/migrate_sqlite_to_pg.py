@@ -30,6 +30,7 @@ from app.core.config import settings
 from app.models.tenant import Tenant
 from app.models.user import User
 from app.models.payment import Payment
+from app.db.init_db import UNKNOWN_CREATED_AT
 import uuid
 
 def get_sqlite_connection():
@@ -103,7 +104,7 @@ def migrate_data():
                 plan_type=user_dict['plan_type'],
                 phone=user_dict.get('phone'),
                 company=user_dict.get('company'),
-                created_at=user_dict['created_at'],
+                created_at=user_dict['created_at'] or UNKNOWN_CREATED_AT,
                 last_login=user_dict.get('last_login'),
                 notes=user_dict.get('notes'),
                 avatar_url=user_dict.get('avatar_url'),
@@ -145,7 +146,7 @@ def migrate_data():
                 amount=payment_dict['amount'],
                 status=payment_dict['status'],
                 reference=payment_dict.get('reference'),
-                created_at=payment_dict['created_at']
+                created_at=payment_dict['created_at'] or UNKNOWN_CREATED_AT
             )
             
             pg_session.add(new_payment)
@@ -0,0 +1,38 @@
+"""
+Shared test fixtures
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.db.base import Base
+
+@pytest.fixture
+def caches_to_clear():
+    """In-process caches ``db_session`` empties around each test; override per module"""
+    return ()
+
+@pytest.fixture
+def db_session(caches_to_clear):
+    """Throwaway in-memory SQLite session"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    for cache in caches_to_clear:
+        cache.clear()
+    try:
+        yield db
+    finally:
+        db.close()
+        for cache in caches_to_clear:
+            cache.clear()
+        engine.dispose()
+
+@pytest.fixture
+def count_queries():
+    """``count_queries(session)`` returns a list that collects every SQL statement run on the session's engine"""
+    def count(session):
+        statements = []
+        event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+        return statements
+    return count
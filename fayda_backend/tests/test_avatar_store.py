@@ -0,0 +1,84 @@
+"""
+Tests for streamed, content-addressed avatar storage and upload size limits
+"""
+
+import asyncio
+import io
+import os
+import time
+import pytest
+from fastapi import FastAPI, HTTPException, Request, UploadFile
+from fastapi.testclient import TestClient
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.services.avatar_store import AVATAR_URL_PREFIX, AvatarStore, sniff_image_type
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 200
+
+def save(store, data):
+    return asyncio.run(store.save(UploadFile(io.BytesIO(data), filename="whatever.txt")))
+
+def test_sniff_image_type():
+    assert sniff_image_type(PNG[:12]) == "png"
+    assert sniff_image_type(b"\xff\xd8\xff\xe0" + b"\x00" * 8) == "jpg"
+    assert sniff_image_type(b"GIF89a" + b"\x00" * 6) == "gif"
+    assert sniff_image_type(b"RIFF\x00\x00\x00\x00WEBP") == "webp"
+    assert sniff_image_type(b"<svg xmlns=") is None
+
+def test_identical_uploads_are_stored_once(tmp_path):
+    store = AvatarStore(tmp_path, max_bytes=1024)
+    first = save(store, PNG)
+    assert save(store, PNG) == first
+    assert first.startswith(AVATAR_URL_PREFIX) and first.endswith(".png")
+    assert os.listdir(tmp_path) == [first[len(AVATAR_URL_PREFIX):]]
+
+def test_non_image_is_rejected_without_leftovers(tmp_path):
+    store = AvatarStore(tmp_path, max_bytes=1024)
+    with pytest.raises(HTTPException) as exc:
+        save(store, b"#!/bin/sh\necho hi\n")
+    assert exc.value.status_code == 400
+    assert os.listdir(tmp_path) == []
+
+def test_oversized_upload_is_rejected_without_leftovers(tmp_path):
+    store = AvatarStore(tmp_path, max_bytes=1024)
+    with pytest.raises(HTTPException) as exc:
+        save(store, PNG + b"\x00" * 200_000)
+    assert exc.value.status_code == 413
+    assert os.listdir(tmp_path) == []
+
+def test_collect_orphans_keeps_referenced_and_recent_files(tmp_path):
+    store = AvatarStore(tmp_path, max_bytes=1024)
+    kept = save(store, PNG)
+    orphan = save(store, PNG + b"\x01")
+    fresh = save(store, PNG + b"\x02")
+    (tmp_path / ".gitkeep").touch()
+    old = time.time() - 7200
+    for url in (kept, orphan):
+        os.utime(tmp_path / url[len(AVATAR_URL_PREFIX):], (old, old))
+
+    assert store.collect_orphans({kept, None}, grace_seconds=3600) == 1
+    names = {AVATAR_URL_PREFIX + name for name in os.listdir(tmp_path)}
+    assert names == {kept, fresh, AVATAR_URL_PREFIX + ".gitkeep"}
+
+def limited_app():
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        return {"size": len(await request.body())}
+
+    app.add_middleware(BodySizeLimitMiddleware, limits={"/upload": 100})
+    return TestClient(app)
+
+def test_body_limit_rejects_declared_length():
+    client = limited_app()
+    assert client.post("/upload", content=b"x" * 100).json() == {"size": 100}
+    assert client.post("/upload", content=b"x" * 101).status_code == 413
+
+def test_body_limit_counts_chunked_bodies():
+    client = limited_app()
+
+    def chunks():
+        for _ in range(5):
+            yield b"x" * 40
+
+    assert client.post("/upload", content=chunks()).status_code == 413
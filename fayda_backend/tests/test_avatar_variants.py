@@ -0,0 +1,123 @@
+"""
+Tests for avatar thumbnail variants
+"""
+
+import asyncio
+import io
+import os
+import signal
+import pytest
+from PIL import Image
+from app.services.avatar_store import AvatarStore
+from app.services import avatar_variants
+from app.services.avatar_variants import AvatarVariantError, AvatarVariants
+
+def stored_png(tmp_path, size=(300, 200), color=(255, 0, 0, 128)):
+    buf = io.BytesIO()
+    Image.new("RGBA", size, color).save(buf, "PNG")
+    source = tmp_path / ("a" * 64 + ".png")
+    source.write_bytes(buf.getvalue())
+    return source
+
+def make_variants(tmp_path):
+    return AvatarVariants(tmp_path / "variants", sizes=[64, 32, 128], workers=0, quality=80)
+
+def test_pick_size_rounds_up_and_caps():
+    variants = AvatarVariants("unused", sizes=[64, 32, 128], workers=0, quality=80)
+    assert variants.pick_size(1) == 32
+    assert variants.pick_size(33) == 64
+    assert variants.pick_size(128) == 128
+    assert variants.pick_size(1000) == 128
+
+def test_variant_is_square_and_cached(tmp_path):
+    source = stored_png(tmp_path)
+    variants = make_variants(tmp_path)
+
+    path = asyncio.run(variants.get(source, 64, "webp"))
+    with Image.open(path) as image:
+        assert (image.format, image.size) == ("WEBP", (64, 64))
+    assert asyncio.run(variants.get(source, 64, "webp")) == path
+    assert variants.stats()["renders"] == 1 and variants.hits == 1
+
+def test_jpeg_variant_flattens_transparency(tmp_path):
+    source = stored_png(tmp_path, color=(0, 0, 0, 0))
+    path = asyncio.run(make_variants(tmp_path).get(source, 32, "jpeg"))
+    with Image.open(path) as image:
+        assert image.mode == "RGB"
+        assert image.getpixel((16, 16)) == (255, 255, 255)
+
+def test_concurrent_requests_share_one_render(tmp_path):
+    source = stored_png(tmp_path)
+    variants = make_variants(tmp_path)
+
+    async def main():
+        return await asyncio.gather(*(variants.get(source, 128, "jpeg") for _ in range(5)))
+
+    assert len(set(asyncio.run(main()))) == 1
+    assert variants.stats()["renders"] == 1
+
+def test_undecodable_avatar_raises_variant_error(tmp_path):
+    source = tmp_path / ("b" * 64 + ".png")
+    source.write_bytes(b"\x89PNG\r\n\x1a\n" + b"garbage" * 10)
+    with pytest.raises(AvatarVariantError):
+        asyncio.run(make_variants(tmp_path).get(source, 32, "webp"))
+    assert os.listdir(tmp_path / "variants") == []
+
+def test_pregenerate_renders_every_size_and_format(tmp_path):
+    source = stored_png(tmp_path)
+    variants = make_variants(tmp_path)
+    asyncio.run(variants.pregenerate(source))
+    assert len(os.listdir(tmp_path / "variants")) == 6
+
+def test_gc_removes_variants_of_removed_avatars(tmp_path):
+    source = stored_png(tmp_path)
+    variants = make_variants(tmp_path)
+    asyncio.run(variants.pregenerate(source))
+    store = AvatarStore(tmp_path, max_bytes=1024)
+
+    assert store.collect_orphans({"/static/avatars/" + source.name}, grace_seconds=0) == 0
+    assert store.collect_orphans(set(), grace_seconds=0) == 7
+    assert os.listdir(tmp_path / "variants") == []
+
+def test_stored_path_rejects_other_names(tmp_path):
+    source = stored_png(tmp_path)
+    store = AvatarStore(tmp_path, max_bytes=1024)
+    assert store.stored_path(source.name) == source
+    assert store.stored_path("../" + source.name) is None
+    assert store.stored_path("c" * 64 + ".png") is None
+
+def crash_worker(*args):
+    os._exit(1)
+
+def test_rendering_in_worker_processes_survives_a_killed_worker(tmp_path):
+    source = stored_png(tmp_path)
+    variants = AvatarVariants(tmp_path / "variants", sizes=[32, 64], workers=1, quality=80)
+
+    async def main():
+        first = await variants.get(source, 32, "webp")
+        for pid in list(variants._pool._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        await asyncio.sleep(0.5)
+        return first, await variants.get(source, 64, "jpeg")
+
+    try:
+        small, large = asyncio.run(main())
+        with Image.open(small) as image:
+            assert (image.format, image.size) == ("WEBP", (32, 32))
+        with Image.open(large) as image:
+            assert (image.format, image.size) == ("JPEG", (64, 64))
+        assert variants.stats()["pool_restarts"] == 1
+    finally:
+        variants.shutdown()
+
+def test_render_that_kills_its_worker_raises_variant_error(tmp_path, monkeypatch):
+    source = stored_png(tmp_path)
+    variants = AvatarVariants(tmp_path / "variants", sizes=[32], workers=1, quality=80)
+    monkeypatch.setattr(avatar_variants, "_render_variant", crash_worker)
+    try:
+        with pytest.raises(AvatarVariantError):
+            asyncio.run(variants.get(source, 32, "webp"))
+        # Retried once on a fresh pool before giving up
+        assert variants.stats()["pool_restarts"] == 2
+    finally:
+        variants.shutdown()
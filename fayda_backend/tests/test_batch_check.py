@@ -0,0 +1,122 @@
+"""
+Tests for the streaming batch ID check endpoint
+"""
+
+import asyncio
+import json
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.auth.jwt import create_access_token
+from app.core.config import settings
+from app.mocks import mock_id_api
+from app.schemas.id_check import MAX_BATCH_ITEMS, BatchCheckRequest
+from app.services.fayda_client import FaydaClient
+from app.services.id_cache import id_cache
+
+class Upstream:
+    """Async Fayda stand-in that counts calls and tracks concurrency"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.cancelled = 0
+
+    async def __call__(self, request):
+        id_number = request.url.path.rsplit("/", 1)[1]
+        self.calls.append(id_number)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(id_number, 0.01))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        if id_number.startswith("missing"):
+            return httpx.Response(404)
+        return httpx.Response(200, json={"name": f"Person {id_number}"})
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = Upstream()
+    client = FaydaClient(base_url="http://fayda.test/api", token="t", transport=httpx.MockTransport(fake))
+    monkeypatch.setattr(mock_id_api, "fayda_client", client)
+    id_cache.clear()
+    yield fake
+    id_cache.clear()
+
+@pytest.fixture
+def api():
+    app = FastAPI()
+    app.include_router(mock_id_api.mock_id_router, prefix="/id")
+    token = create_access_token({"sub": "checker@example.com", "role": "user"})
+    with TestClient(app, headers={"Authorization": f"Bearer {token}"}) as client:
+        yield client
+
+def lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+def test_streams_one_ndjson_line_per_distinct_id(api, upstream):
+    response = api.post("/id/batch-check", json={"id_numbers": ["1", "missing-2", "1", "3"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text.endswith("\n")
+    results = lines(response)
+    assert [r["id_number"] for r in results] == ["1", "missing-2", "3"]
+    assert [r["valid"] for r in results] == [True, False, True]
+    assert {r["checked_by"] for r in results} == {"checker@example.com"}
+    assert sorted(upstream.calls) == ["1", "3", "missing-2"]
+
+def test_too_many_distinct_ids_is_413(api, upstream, monkeypatch):
+    monkeypatch.setattr(settings, "fayda_batch_max_ids", 2)
+    assert api.post("/id/batch-check", json={"id_numbers": ["1", "2", "2", "1"]}).status_code == 200
+    response = api.post("/id/batch-check", json={"id_numbers": ["1", "2", "3"]})
+    assert response.status_code == 413
+    assert sorted(upstream.calls) == ["1", "2"]
+
+def test_raw_list_is_bounded_before_parsing(api, upstream):
+    response = api.post("/id/batch-check", json={"id_numbers": ["1"] * (MAX_BATCH_ITEMS + 1)})
+    assert response.status_code == 422
+    assert upstream.calls == []
+
+def test_input_order_vs_completion_order(api, upstream):
+    upstream.delays = {"slow": 0.2, "fast": 0.0}
+    body = {"id_numbers": ["slow", "fast"]}
+    in_order = lines(api.post("/id/batch-check", json={**body, "order": "input"}))
+    assert [r["id_number"] for r in in_order] == ["slow", "fast"]
+    id_cache.clear()
+    completed = lines(api.post("/id/batch-check", json={**body, "order": "completion"}))
+    assert [r["id_number"] for r in completed] == ["fast", "slow"]
+
+def test_upstream_concurrency_is_bounded(api, upstream, monkeypatch):
+    monkeypatch.setattr(settings, "fayda_batch_concurrency", 3)
+    upstream.delays = {str(n): 0.02 for n in range(12)}
+    response = api.post("/id/batch-check", json={"id_numbers": [str(n) for n in range(12)]})
+    assert len(lines(response)) == 12
+    assert upstream.max_active == 3
+
+def test_disconnect_cancels_pending_lookups(upstream, monkeypatch):
+    monkeypatch.setattr(settings, "fayda_batch_concurrency", 10)
+    upstream.delays = {"first": 0.0, **{f"hang-{n}": 30 for n in range(5)}}
+    payload = BatchCheckRequest(id_numbers=["first"] + [f"hang-{n}" for n in range(5)])
+
+    async def main():
+        response = await mock_id_api.batch_check(
+            payload, current_user={"email": "checker@example.com"}, x_fayda_cache=None, cache_control=None,
+        )
+        body = response.body_iterator
+        first = json.loads(await body.__anext__())
+        # What Starlette does when the client goes away mid-stream
+        await body.aclose()
+        await asyncio.sleep(0.05)
+        await mock_id_api.fayda_client.shutdown()
+        return first
+
+    assert asyncio.run(main())["id_number"] == "first"
+    assert upstream.cancelled == 5
+    assert upstream.active == 0
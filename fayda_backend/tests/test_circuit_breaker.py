@@ -0,0 +1,92 @@
+"""
+Tests for the upstream circuit breaker
+"""
+
+from app.core.circuit_breaker import CircuitBreaker
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_breaker(clock):
+    return CircuitBreaker(
+        "test",
+        failure_rate_threshold=0.5,
+        slow_call_rate_threshold=0.8,
+        slow_call_seconds=1.0,
+        window_size=4,
+        min_calls=4,
+        open_seconds=10,
+        half_open_max_calls=2,
+        clock=clock,
+    )
+
+def test_opens_on_failure_rate_and_fails_fast():
+    breaker = make_breaker(FakeClock())
+    for _ in range(2):
+        breaker.record_success(0.1)
+    for _ in range(2):
+        breaker.record_failure(0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is False
+    assert breaker.snapshot()["rejected"] == 1
+
+def test_opens_on_slow_calls():
+    breaker = make_breaker(FakeClock())
+    for _ in range(4):
+        breaker.record_success(2.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_half_open_probes_close_on_success():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure(0.1)
+    clock.now = 11
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() and breaker.allow()
+    assert breaker.allow() is False  # probe limit reached
+    breaker.record_success(0.1)
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_failure_reopens():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.record_failure(0.1)
+    clock.now = 11
+    assert breaker.allow()
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.snapshot()["times_opened"] == 2
+
+def test_calls_in_flight_when_breaker_opens_are_ignored():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    in_flight = [breaker.admit() for _ in range(8)]
+    for generation in in_flight[:4]:
+        breaker.record_failure(0.1, generation)
+    assert breaker.state == "open"
+
+    # Late failures from the old window neither re-open nor extend the open period
+    clock.now = 5
+    for generation in in_flight[4:6]:
+        breaker.record_failure(0.1, generation)
+    assert breaker.snapshot()["times_opened"] == 1
+    clock.now = 10
+    assert breaker.state == "half_open"
+
+    # Late results landing in half-open are not probe outcomes
+    probe = breaker.admit()
+    breaker.record_success(0.1, in_flight[6])
+    breaker.record_failure(0.1, in_flight[7])
+    breaker.release(in_flight[7])
+    assert breaker.state == "half_open"
+    assert breaker.admit() is not None
+    assert breaker.admit() is None  # still two probe slots taken
+    breaker.record_success(0.1, probe)
+    assert breaker.state == "half_open"
@@ -0,0 +1,127 @@
+"""
+Tests for streaming admin exports
+"""
+
+import csv
+import datetime
+import decimal
+import gzip
+import io
+import ipaddress
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.endpoints import export
+from app.core.config import settings
+from app.core.principal import Principal
+from app.core.security import get_current_principal
+from app.db.base import AuditEvent, Base, Payment, Tenant, User
+from app.services import export_service
+
+@pytest.fixture
+def sqlite_sessions(monkeypatch):
+    """
+    Point the export service at an in-memory SQLite database with 5 users,
+    a payment for each and 2 audit events
+    """
+    # One shared connection: the endpoint streams the body from a worker thread
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    tenant = Tenant(name="acme", status="active")
+    db.add(tenant)
+    db.flush()
+    for n in range(5):
+        db.add(User(
+            tenant_id=tenant.id,
+            full_name=f"User {n}",
+            email=f"user{n}@example.com",
+            hashed_password="secret-hash",
+            created_at=datetime.datetime(2025, 1, 1 + n),
+        ))
+    db.flush()
+    for user in db.query(User).order_by(User.id):
+        db.add(Payment(
+            tenant_id=tenant.id, user_id=user.id, method="telebirr", amount=10.5 * user.id,
+            status="completed", reference=f"PAY-{user.id}", created_at=user.created_at,
+        ))
+    for n, ip in enumerate(["10.0.0.1", None]):
+        db.add(AuditEvent(
+            tenant_id=tenant.id, action="user.login", target_type="user", target_id=str(n + 1),
+            ip=ip, user_agent="pytest", created_at=datetime.datetime(2025, 2, 1 + n),
+        ))
+    db.commit()
+    tenant_id = tenant.id
+    db.close()
+    monkeypatch.setattr(export_service, "ReadSessionLocal", factory)
+    monkeypatch.setattr(settings, "export_batch_size", 2)
+    return tenant_id
+
+def test_csv_export_streams_in_batches(sqlite_sessions):
+    chunks = list(export_service.export_stream("users", "csv"))
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert [r["email"] for r in rows] == [f"user{n}@example.com" for n in range(5)]
+    assert "hashed_password" not in rows[0]
+
+def test_ndjson_export_with_filters(sqlite_sessions):
+    body = "".join(export_service.export_stream(
+        "users", "ndjson", tenant_id=sqlite_sessions,
+        date_from=datetime.datetime(2025, 1, 2), date_to=datetime.datetime(2025, 1, 4),
+    ))
+    records = [json.loads(line) for line in body.splitlines()]
+    assert [r["email"] for r in records] == ["user1@example.com", "user2@example.com"]
+    assert records[0]["tenant_id"] == str(sqlite_sessions)
+    assert records[0]["created_at"] == "2025-01-02T00:00:00"
+
+def test_gzip_export_decompresses_to_plain_export(sqlite_sessions):
+    plain = "".join(export_service.export_stream("users", "csv"))
+    compressed = b"".join(export_service.export_stream("users", "csv", gzip=True))
+    assert gzip.decompress(compressed).decode() == plain
+
+def test_payments_export(sqlite_sessions):
+    rows = list(csv.DictReader(io.StringIO("".join(export_service.export_stream("payments", "csv")))))
+    assert [r["reference"] for r in rows] == [f"PAY-{n}" for n in range(1, 6)]
+    assert rows[0]["amount"] == "10.5"
+    assert rows[0]["tenant_id"] == str(sqlite_sessions)
+
+def test_audit_events_export_includes_ip(sqlite_sessions):
+    body = "".join(export_service.export_stream("audit-events", "ndjson"))
+    records = [json.loads(line) for line in body.splitlines()]
+    assert [(r["action"], r["ip"]) for r in records] == [("user.login", "10.0.0.1"), ("user.login", None)]
+
+def test_non_json_column_values_are_exported_as_text():
+    # psycopg returns ipaddress objects for INET columns on PostgreSQL
+    values = [export_service._plain(ipaddress.ip_address("2001:db8::1")), export_service._plain(decimal.Decimal("12.50"))]
+    assert values == ["2001:db8::1", "12.50"]
+    line = next(export_service.ndjson_chunks(["ip", "amount"], [tuple(values)]))
+    assert json.loads(line) == {"ip": "2001:db8::1", "amount": "12.50"}
+
+def export_client(role: str) -> TestClient:
+    app = FastAPI()
+    app.include_router(export.router, prefix="/admin/export")
+    app.dependency_overrides[get_current_principal] = lambda: Principal(
+        id=1, email=f"{role}@example.com", tenant_id=None, role=role, status="active",
+    )
+    return TestClient(app)
+
+def test_export_endpoint_streams_an_attachment(sqlite_sessions):
+    with export_client("admin") as client:
+        response = client.get("/admin/export/audit-events", params={"format": "ndjson"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.headers["content-disposition"] == 'attachment; filename="audit-events.ndjson"'
+        assert len(response.text.splitlines()) == 2
+
+        response = client.get("/admin/export/payments", params={"gzip": "true"})
+        assert response.headers["content-type"] == "application/gzip"
+        assert response.headers["content-disposition"] == 'attachment; filename="payments.csv.gz"'
+
+def test_export_endpoint_requires_admin(sqlite_sessions):
+    with export_client("user") as client:
+        assert client.get("/admin/export/users").status_code == 403
@@ -0,0 +1,66 @@
+"""
+Tests for the pooled Fayda upstream client
+"""
+
+import asyncio
+import httpx
+import pytest
+from app.services.fayda_client import FaydaClient, FaydaUpstreamError, FaydaCircuitOpenError
+
+def make_client(handler):
+    return FaydaClient(base_url="http://fayda.test/api", token="t", transport=httpx.MockTransport(handler))
+
+def run(client, coro_fn):
+    async def main():
+        await client.startup()
+        try:
+            return await coro_fn()
+        finally:
+            await client.shutdown()
+    return asyncio.run(main())
+
+def test_found_returns_record():
+    def handler(request):
+        assert request.url.path == "/api/check/123"
+        assert request.headers["Authorization"] == "Bearer t"
+        return httpx.Response(200, json={"name": "Abebe"})
+
+    client = make_client(handler)
+    assert run(client, lambda: client.check_id("123")) == {"name": "Abebe"}
+
+def test_not_found_returns_none():
+    client = make_client(lambda request: httpx.Response(404))
+    assert run(client, lambda: client.check_id("123")) is None
+
+def test_server_error_raises():
+    client = make_client(lambda request: httpx.Response(503))
+    with pytest.raises(FaydaUpstreamError):
+        run(client, lambda: client.check_id("123"))
+
+def test_transport_error_raises():
+    def handler(request):
+        raise httpx.ConnectError("down")
+
+    client = make_client(handler)
+    with pytest.raises(FaydaUpstreamError):
+        run(client, lambda: client.check_id("123"))
+
+def test_open_breaker_fails_fast_without_calling_upstream():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = make_client(handler)
+    client.breaker.min_calls = 2
+
+    async def checks():
+        for _ in range(3):
+            with pytest.raises(FaydaUpstreamError) as exc_info:
+                await client.check_id("123")
+        return exc_info.value
+
+    last_error = run(client, checks)
+    assert isinstance(last_error, FaydaCircuitOpenError)
+    assert len(calls) == 2
@@ -0,0 +1,54 @@
+"""
+Tests for the local Fayda API stand-in
+"""
+
+import random
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.mocks import fayda_upstream
+from app.mocks.fayda_upstream import FIRST_SYNTHETIC_ID, StubConfig
+
+@pytest.fixture
+def stub(monkeypatch):
+    # PUT /api/stub/config rebinds these globals; monkeypatch restores them
+    monkeypatch.setattr(fayda_upstream, "config", StubConfig(latency="none", seed=1))
+    monkeypatch.setattr(fayda_upstream, "rng", random.Random(1))
+    with TestClient(fayda_upstream.app) as client:
+        yield client
+
+def test_seeded_dataset_is_found_and_deterministic(stub):
+    fixed = stub.get("/api/check/123456789")
+    assert fixed.status_code == 200
+    assert fixed.json()["name"] == "Abebe Kebede"
+
+    synthetic = stub.get(f"/api/check/{FIRST_SYNTHETIC_ID + 42}")
+    assert synthetic.status_code == 200
+    assert synthetic.json() == stub.get(f"/api/check/{FIRST_SYNTHETIC_ID + 42}").json()
+    assert set(synthetic.json()) == {"name", "dob", "photo_url"}
+
+@pytest.mark.parametrize("id_number", ["000000001", str(FIRST_SYNTHETIC_ID + 1_000_000), "not-an-id"])
+def test_ids_outside_the_dataset_are_404(stub, id_number):
+    assert stub.get(f"/api/check/{id_number}").status_code == 404
+
+def test_error_rate_one_always_fails(stub):
+    stub.put("/api/stub/config", json={"latency": "none", "error_rate": 1.0})
+    statuses = {stub.get("/api/check/123456789").status_code for _ in range(10)}
+    assert statuses == {503}
+
+def test_config_update_takes_effect(stub):
+    assert stub.get(f"/api/check/{FIRST_SYNTHETIC_ID + 5}").status_code == 200
+    response = stub.put("/api/stub/config", json={"latency": "none", "dataset_size": 5})
+    assert response.status_code == 200
+    assert response.json()["dataset_size"] == 5
+    assert stub.get("/api/stub/config").json()["dataset_size"] == 5
+    assert stub.get(f"/api/check/{FIRST_SYNTHETIC_ID + 5}").status_code == 404
+    assert stub.get(f"/api/check/{FIRST_SYNTHETIC_ID + 4}").status_code == 200
+
+def test_use_local_stub_switches_base_url(monkeypatch):
+    monkeypatch.setattr(settings, "fayda_api_url", "https://fayda.example/api")
+    monkeypatch.setattr(settings, "fayda_local_stub_url", "http://127.0.0.1:9100/api")
+    monkeypatch.setattr(settings, "fayda_use_local_stub", False)
+    assert settings.fayda_base_url == "https://fayda.example/api"
+    monkeypatch.setattr(settings, "fayda_use_local_stub", True)
+    assert settings.fayda_base_url == "http://127.0.0.1:9100/api"
@@ -0,0 +1,105 @@
+"""
+Tests for caching of Fayda ID lookups at the /id/mock-id-check endpoint
+"""
+
+import hashlib
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.auth.jwt import create_access_token
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.mocks import mock_id_api
+from app.services import id_cache
+from app.services.fayda_client import FaydaClient
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class CountingUpstream:
+    """Fayda stand-in that knows one ID and counts every request"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        if request.url.path.endswith("/123456789"):
+            return httpx.Response(200, json={"name": "Abebe Kebede", "dob": "1992-03-15"})
+        return httpx.Response(404)
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(id_cache, "id_cache", TTLCache(maxsize=100, ttl=300, clock=clock))
+    monkeypatch.setattr(settings, "fayda_cache_enabled", True)
+    monkeypatch.setattr(settings, "fayda_cache_ttl_seconds", 300.0)
+    monkeypatch.setattr(settings, "fayda_cache_negative_ttl_seconds", 30.0)
+    return clock
+
+@pytest.fixture
+def upstream(monkeypatch):
+    counter = CountingUpstream()
+    client = FaydaClient(base_url="http://fayda.test/api", token="t", transport=httpx.MockTransport(counter))
+    monkeypatch.setattr(mock_id_api, "fayda_client", client)
+    return counter
+
+@pytest.fixture
+def api():
+    app = FastAPI()
+    app.include_router(mock_id_api.mock_id_router, prefix="/id")
+    token = create_access_token({"sub": "checker@example.com", "role": "user"})
+    with TestClient(app, headers={"Authorization": f"Bearer {token}"}) as client:
+        yield client
+
+def test_second_lookup_is_served_from_cache(api, upstream, clock):
+    first = api.get("/id/mock-id-check/123456789").json()
+    second = api.get("/id/mock-id-check/123456789").json()
+    assert first == second
+    assert second["valid"] is True and second["name"] == "Abebe Kebede"
+    assert upstream.calls == 1
+
+def test_not_found_uses_shorter_negative_ttl(api, upstream, clock):
+    assert api.get("/id/mock-id-check/000000000").json()["valid"] is False
+    assert api.get("/id/mock-id-check/123456789").json()["valid"] is True
+    assert upstream.calls == 2
+
+    clock.now = 29
+    api.get("/id/mock-id-check/000000000")
+    assert upstream.calls == 2
+
+    # Past the negative TTL the miss is asked again; the hit is still cached
+    clock.now = 31
+    api.get("/id/mock-id-check/000000000")
+    api.get("/id/mock-id-check/123456789")
+    assert upstream.calls == 3
+
+    clock.now = 301
+    api.get("/id/mock-id-check/123456789")
+    assert upstream.calls == 4
+
+@pytest.mark.parametrize("headers", [{"X-Fayda-Cache": "bypass"}, {"Cache-Control": "no-cache"}])
+def test_bypass_headers_skip_the_cache_read(api, upstream, clock, headers):
+    api.get("/id/mock-id-check/123456789")
+    api.get("/id/mock-id-check/123456789", headers=headers)
+    assert upstream.calls == 2
+    # The bypassing lookup refreshed the entry, so a plain one still hits
+    api.get("/id/mock-id-check/123456789")
+    assert upstream.calls == 2
+
+def test_cache_keys_are_hmacs_not_id_numbers(api, upstream, clock):
+    api.get("/id/mock-id-check/123456789")
+    api.get("/id/mock-id-check/000000000")
+    keys = list(id_cache.id_cache._data)
+    assert len(keys) == 2
+    assert set(keys) == {id_cache.cache_key("123456789"), id_cache.cache_key("000000000")}
+    for key in keys:
+        assert "123456789" not in key and "000000000" not in key
+        assert len(key) == 64
+    # Keyed with a per-process secret, so not recomputable from the ID alone
+    assert hashlib.sha256(b"123456789").hexdigest() not in keys
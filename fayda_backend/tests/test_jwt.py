@@ -0,0 +1,45 @@
+"""
+Tests for the unified access-token verifier
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from jose import jwt, JWTError
+from app.auth import jwt as token_module
+from app.auth.jwt import create_access_token, decode_access_token, claims_cache
+from app.core.config import settings
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    claims_cache.clear()
+    yield
+    claims_cache.clear()
+
+def test_round_trip_with_kid():
+    token = create_access_token({"sub": "a@example.com", "role": "user", "tenant_id": "t1"})
+    assert jwt.get_unverified_header(token)["kid"] == settings.jwt_active_kid
+    claims = decode_access_token(token)
+    assert (claims.sub, claims.role, claims.tenant_id) == ("a@example.com", "user", "t1")
+
+def test_claims_are_cached_per_token(monkeypatch):
+    token = create_access_token({"sub": "a@example.com", "role": "user"})
+    decode_access_token(token)
+    monkeypatch.setattr(token_module.jwt, "decode", lambda *a, **k: pytest.fail("signature checked twice"))
+    assert decode_access_token(token).sub == "a@example.com"
+
+def test_rotated_key_still_verifies(monkeypatch):
+    old = jwt.encode({"sub": "old@example.com", "exp": datetime.utcnow() + timedelta(minutes=5)},
+                     "old-secret", algorithm=settings.jwt_algorithm, headers={"kid": "old"})
+    with pytest.raises(JWTError):
+        decode_access_token(old)
+    monkeypatch.setattr(settings, "jwt_keys", {"old": "old-secret"})
+    assert decode_access_token(old).sub == "old@example.com"
+
+def test_legacy_token_without_kid():
+    legacy = jwt.encode({"sub": "legacy@example.com"}, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    assert decode_access_token(legacy).sub == "legacy@example.com"
+
+def test_expired_token_rejected():
+    token = create_access_token({"sub": "a@example.com"}, expires_delta=timedelta(seconds=-1))
+    with pytest.raises(JWTError):
+        decode_access_token(token)
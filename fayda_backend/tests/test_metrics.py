@@ -0,0 +1,45 @@
+"""
+Tests for Prometheus request and query metrics
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.sql_profiler import SQLProfilerMiddleware
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def test_requests_labelled_by_template_with_query_counts():
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(SQLProfilerMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics-test/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"id": item_id}
+
+    labels = {"method": "GET", "route": "/metrics-test/{item_id}", "status": "200"}
+    before = sample("http_request_duration_seconds_count", **labels)
+    queries_before = sample("db_queries_per_request_sum", route="/metrics-test/{item_id}")
+
+    client = TestClient(app)
+    client.get("/metrics-test/1")
+    client.get("/metrics-test/2")
+    client.get("/not-a-route")
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 2
+    assert sample("db_queries_per_request_sum", route="/metrics-test/{item_id}") == queries_before + 4
+    assert sample("http_request_duration_seconds_count", method="GET", route="<unmatched>", status="404") >= 1
+
+def test_exposition_includes_app_stats():
+    body, content_type = render_metrics()
+    assert content_type.startswith("text/plain")
+    assert b"app_cache_hit_ratio" in body
+    assert b"fayda_breaker_state" in body
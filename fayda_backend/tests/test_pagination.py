@@ -0,0 +1,179 @@
+"""
+Tests for keyset pagination of the admin user listing
+"""
+
+import asyncio
+import datetime
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.pagination import clamp_limit, decode_cursor, encode_cursor
+from app.crud.user import get_users_page
+from app.db.base import Base, Tenant, User
+from app.db.init_db import UNKNOWN_CREATED_AT, backfill_created_at
+
+def legacy_engine(*tables, url="sqlite://"):
+    """SQLite schema from before ``created_at`` on ``tables`` was NOT NULL"""
+    legacy = MetaData()
+    for table in Base.metadata.sorted_tables:
+        table.to_metadata(legacy)
+    for name in tables:
+        legacy.tables[name].c.created_at.nullable = True
+    engine = create_engine(url)
+    legacy.create_all(bind=engine)
+    return engine
+
+@pytest.fixture
+def db_session(db_session):
+    """The shared in-memory SQLite session, with two tenants' worth of users"""
+    db = db_session
+    acme, other = Tenant(name="acme", status="active"), Tenant(name="other", status="active")
+    db.add_all([acme, other])
+    db.flush()
+    same_time = datetime.datetime(2025, 1, 1)
+    for n in range(7):
+        db.add(User(
+            tenant_id=acme.id if n < 5 else other.id,
+            full_name=f"User {n}",
+            email=f"user{n}@example.com",
+            hashed_password="x",
+            role="admin" if n == 0 else "user",
+            # Ties on created_at must still page deterministically by id
+            created_at=same_time if n % 2 else same_time + datetime.timedelta(minutes=n),
+        ))
+    db.commit()
+    return db
+
+def test_pages_cover_every_user_once(db_session):
+    seen, cursor = [], None
+    while True:
+        users, cursor = get_users_page(db_session, limit=3, cursor=cursor)
+        seen += [(u.created_at, u.id) for u in users]
+        if cursor is None:
+            break
+    assert len(seen) == 7
+    assert seen == sorted(seen, reverse=True)
+
+def test_filters_apply_across_pages(db_session):
+    acme = db_session.query(Tenant).filter(Tenant.name == "acme").one()
+    first, cursor = get_users_page(db_session, limit=2, tenant_id=acme.id, role="user")
+    rest, end = get_users_page(db_session, limit=2, cursor=cursor, tenant_id=acme.id, role="user")
+    assert end is None
+    assert {u.email for u in first + rest} == {f"user{n}@example.com" for n in range(1, 5)}
+
+def test_limit_is_capped():
+    assert clamp_limit(None) == settings.page_size_default
+    assert clamp_limit(10 ** 6) == settings.page_size_max
+
+def test_cursor_roundtrip_and_rejects_garbage():
+    when = datetime.datetime(2025, 1, 1, 12, 30)
+    assert decode_cursor(encode_cursor(when, 42)) == (when, 42)
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+def test_payment_history_pages_with_filters(db_session):
+    from app.crud.payment import get_payments_page
+    from app.models.payment import Payment
+
+    user = db_session.query(User).filter(User.email == "user1@example.com").one()
+    start = datetime.datetime(2025, 3, 1)
+    for n in range(6):
+        db_session.add(Payment(
+            tenant_id=user.tenant_id,
+            user_id=user.id,
+            method="telebirr" if n % 2 else "cbe",
+            amount=10.0 + n,
+            status="success",
+            created_at=start + datetime.timedelta(days=n),
+        ))
+    db_session.commit()
+
+    first, cursor = get_payments_page(db_session, limit=2, user_id=user.id, method="telebirr")
+    rest, end = get_payments_page(db_session, limit=2, cursor=cursor, user_id=user.id, method="telebirr")
+    assert [p.amount for p in first + rest] == [15.0, 13.0, 11.0]
+    assert end is None
+
+    window, _ = get_payments_page(
+        db_session, limit=10, user_id=user.id,
+        date_from=start + datetime.timedelta(days=1), date_to=start + datetime.timedelta(days=3),
+    )
+    assert [p.amount for p in window] == [12.0, 11.0]
+
+def test_created_at_is_required():
+    assert User.__table__.c.created_at.nullable is False
+    assert {"ix_users_created", "ix_users_tenant_created"} <= {ix.name for ix in User.__table__.indexes}
+
+def test_backfilled_null_created_at_pages_as_oldest():
+    engine = legacy_engine("users")
+    db = sessionmaker(bind=engine)()
+    tenant = Tenant(name="acme", status="active")
+    db.add(tenant)
+    db.flush()
+    for n in range(4):
+        db.add(User(tenant_id=tenant.id, full_name=f"U{n}", email=f"u{n}@example.com", hashed_password="x"))
+    db.flush()
+    db.execute(User.__table__.update().where(User.id == 1).values(created_at=datetime.datetime(2025, 1, 1)))
+    db.execute(User.__table__.update().where(User.id != 1).values(created_at=None))
+    db.commit()
+
+    assert backfill_created_at(engine) == 3
+    seen, cursor = [], None
+    while True:
+        users, cursor = get_users_page(db, limit=1, cursor=cursor)
+        seen += users
+        if cursor is None:
+            break
+    assert [u.id for u in seen] == [1, 4, 3, 2]
+    assert seen[-1].created_at == UNKNOWN_CREATED_AT
+    db.close()
+
+def test_backfilled_null_created_at_payments_page_without_gaps(tmp_path):
+    from app.crud.payment import get_payments_page, get_payments_page_async
+    from app.models.payment import Payment
+
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = legacy_engine("payments", url=url)
+    db = sessionmaker(bind=engine)()
+    tenant = Tenant(name="acme", status="active")
+    db.add(tenant)
+    db.flush()
+    user = User(tenant_id=tenant.id, full_name="U", email="u@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    for n in range(5):
+        db.add(Payment(tenant_id=tenant.id, user_id=user.id, method="cbe", amount=float(n), status="success"))
+    db.flush()
+    # A payment history with NULL created_at in the middle and at the end
+    db.execute(Payment.__table__.update().where(Payment.id.in_([2, 4, 5])).values(created_at=None))
+    db.execute(Payment.__table__.update().where(Payment.id == 1).values(created_at=datetime.datetime(2025, 1, 2)))
+    db.execute(Payment.__table__.update().where(Payment.id == 3).values(created_at=datetime.datetime(2025, 1, 1)))
+    db.commit()
+
+    assert backfill_created_at(engine) == 3
+    seen, cursor = [], None
+    while True:
+        payments, cursor = get_payments_page(db, limit=1, cursor=cursor, user_id=user.id)
+        seen += [p.id for p in payments]
+        if cursor is None:
+            break
+    assert seen == [1, 3, 5, 4, 2]
+    db.close()
+
+    async def page_async():
+        async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+        try:
+            async with AsyncSession(async_engine) as session:
+                ids, cursor = [], None
+                while True:
+                    payments, cursor = await get_payments_page_async(session, limit=2, cursor=cursor, user_id=user.id)
+                    ids += [p.id for p in payments]
+                    if cursor is None:
+                        return ids
+        finally:
+            await async_engine.dispose()
+
+    assert asyncio.run(page_async()) == [1, 3, 5, 4, 2]
@@ -0,0 +1,42 @@
+"""
+Tests for the off-loop password hashing service
+"""
+
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.services.password_service import PasswordHasher
+
+def test_hash_and_verify_round_trip():
+    hasher = PasswordHasher(workers=0, max_pending=4)
+
+    async def main():
+        hashed = await hasher.hash("s3cret!")
+        return await hasher.verify("s3cret!", hashed), await hasher.verify("wrong", hashed)
+
+    assert asyncio.run(main()) == (True, False)
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["queue_depth"] == 0
+
+def test_rejects_when_queue_is_full():
+    hasher = PasswordHasher(workers=0, max_pending=0)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(hasher.hash("s3cret!"))
+    assert exc_info.value.status_code == 503
+    assert hasher.stats()["rejected"] == 1
+
+def test_outdated_cost_is_rehashed_on_verify():
+    from passlib.context import CryptContext
+    from app.core.config import settings
+
+    old_rounds = 4 if settings.bcrypt_rounds != 4 else 5
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=old_rounds).hash("s3cret!")
+    hasher = PasswordHasher(workers=0, max_pending=4)
+
+    valid, new_hash = asyncio.run(hasher.verify_and_update("s3cret!", old_hash))
+    assert valid
+    assert new_hash.startswith(f"$2b${settings.bcrypt_rounds:02d}$")
+
+    valid, again = asyncio.run(hasher.verify_and_update("s3cret!", new_hash))
+    assert valid and again is None
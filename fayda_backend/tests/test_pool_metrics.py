@@ -0,0 +1,61 @@
+"""
+Tests for connection-pool profiles and instrumentation
+"""
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, instrument_pool
+from app.db.session import engine_options
+
+@pytest.fixture
+def small_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 1)
+    monkeypatch.setattr(settings, "db_max_overflow", 1)
+    monkeypatch.setattr(settings, "db_pool_timeout", 0.05)
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **engine_options(url))
+    metrics = instrument_pool(engine, "test")
+    yield engine, metrics
+    engine.dispose()
+
+def test_checkouts_overflow_and_timeouts_are_reported(small_pool):
+    engine, metrics = small_pool
+    first, second = engine.connect(), engine.connect()
+    snapshot = metrics.snapshot()
+    assert snapshot["checked_out"] == 2
+    assert snapshot["overflow"] == 1
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    first.close()
+    second.close()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["timeouts"] == 1
+    assert snapshot["checkouts"] == 2
+    assert snapshot["wait_seconds"]["count"] == 3
+    assert snapshot["wait_seconds"]["max"] >= 0.05
+    assert snapshot["wait_seconds"]["buckets"]["+Inf"] == 3
+
+def test_invalidations_are_counted(small_pool):
+    engine, metrics = small_pool
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.invalidate()
+    assert metrics.snapshot()["invalidations"] == 1
+
+def test_metrics_survive_dispose(small_pool):
+    engine, metrics = small_pool
+    engine.dispose()
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    engine.connect().close()
+    assert metrics.snapshot()["checkouts"] == 1
+
+def test_pgbouncer_profile_disables_prepared_statements(monkeypatch):
+    monkeypatch.setattr(settings, "db_pgbouncer", True)
+    sync_args = engine_options("postgresql+psycopg://db/app")["connect_args"]
+    async_args = engine_options("postgresql+asyncpg://db/app", is_async=True)["connect_args"]
+    assert sync_args["prepare_threshold"] is None
+    assert async_args["statement_cache_size"] == 0
+    assert async_args["prepared_statement_cache_size"] == 0
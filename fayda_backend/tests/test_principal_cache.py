@@ -0,0 +1,40 @@
+"""
+Tests for the authenticated principal cache
+"""
+
+import pytest
+from app.db.base import Tenant, User
+from app.core.principal import load_principal, principal_cache
+from app.crud import user as crud_user
+
+@pytest.fixture
+def caches_to_clear():
+    return (principal_cache,)
+
+@pytest.fixture
+def user(db_session):
+    tenant = Tenant(name="default", status="active")
+    db_session.add(tenant)
+    db_session.flush()
+    user = User(tenant_id=tenant.id, full_name="Cache User", email="cache@example.com", hashed_password="x", role="user")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+def test_second_lookup_hits_cache(db_session, user, count_queries):
+    tenant_id = user.tenant_id
+    statements = count_queries(db_session)
+    first = load_principal(db_session, "cache@example.com")
+    second = load_principal(db_session, "cache@example.com")
+    assert first == second
+    assert first.role == "user" and first.tenant_id == tenant_id
+    assert len(statements) == 1
+    assert "bio" not in statements[0]
+
+def test_role_change_invalidates(db_session, user):
+    load_principal(db_session, "cache@example.com")
+    crud_user.update_user_role(db_session, user.id, "admin")
+    assert load_principal(db_session, "cache@example.com").role == "admin"
+
+def test_unknown_subject_returns_none(db_session):
+    assert load_principal(db_session, "nobody@example.com") is None
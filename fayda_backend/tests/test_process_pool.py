@@ -0,0 +1,62 @@
+"""
+Tests for the self-replacing process pool
+"""
+
+import asyncio
+import os
+import signal
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from app.core.process_pool import ProcessPool
+from app.services.password_service import PasswordHasher
+
+def crash_once(marker: str) -> str:
+    # The first call kills its worker mid-task, as an OOM kill would
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "ok"
+
+def always_crash() -> None:
+    os._exit(1)
+
+def kill_workers(pool: ProcessPool) -> None:
+    for pid in list(pool._executor._processes):
+        os.kill(pid, signal.SIGKILL)
+
+def test_call_on_a_dying_worker_is_retried_on_a_new_pool(tmp_path):
+    pool = ProcessPool(workers=1)
+    try:
+        assert asyncio.run(pool.run(crash_once, str(tmp_path / "crashed"))) == "ok"
+        assert pool.restarts == 1
+    finally:
+        pool.shutdown()
+
+def test_gives_up_after_the_retry_and_recovers_afterwards(tmp_path):
+    pool = ProcessPool(workers=1)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            asyncio.run(pool.run(always_crash))
+        assert pool.restarts == 2
+        marker = tmp_path / "crashed"
+        marker.touch()
+        assert asyncio.run(pool.run(crash_once, str(marker), retries=0)) == "ok"
+    finally:
+        pool.shutdown()
+
+def test_password_hasher_recovers_from_a_killed_worker():
+    hasher = PasswordHasher(workers=1, max_pending=4)
+
+    async def main():
+        hashed = await hasher.hash("s3cret!")
+        kill_workers(hasher._pool)
+        # Give the pool's management thread time to notice the dead worker
+        await asyncio.sleep(0.5)
+        return await hasher.verify("s3cret!", hashed), await hasher.verify("wrong", hashed)
+
+    try:
+        assert asyncio.run(main()) == (True, False)
+        assert hasher.stats()["pool_restarts"] == 1
+        assert hasher.stats()["queue_depth"] == 0
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,92 @@
+"""
+Tests for read-replica routing
+"""
+
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from app.db import replicas
+from app.db.base import Base, Tenant
+from app.db.replicas import ReplicaSet, RoutingSession, request_writes
+
+def make_db(path, tenant_name):
+    """SQLite file whose only tenant's name tells us which database answered"""
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(Tenant.__table__.insert().values(name=tenant_name, status="active"))
+    engine.dispose()
+    return url
+
+@pytest.fixture
+def routed(tmp_path, monkeypatch):
+    primary = create_engine(make_db(tmp_path / "primary.db", "primary"))
+    replica_set = ReplicaSet([make_db(tmp_path / "r0.db", "replica-0"), make_db(tmp_path / "r1.db", "replica-1")])
+    monkeypatch.setattr(replicas, "engine", primary)
+    monkeypatch.setattr(replicas, "replica_set", replica_set)
+    yield replica_set
+    primary.dispose()
+    asyncio.run(replica_set.dispose())
+
+def answered_by(session) -> str:
+    return session.query(Tenant.name).order_by(Tenant.created_at).first()[0]
+
+def test_reads_round_robin_over_replicas(routed):
+    seen = set()
+    for _ in range(4):
+        with RoutingSession() as db:
+            seen.add(answered_by(db))
+    assert seen == {"replica-0", "replica-1"}
+
+def test_a_session_keeps_its_replica(routed):
+    with RoutingSession() as db:
+        first = answered_by(db)
+        assert first.startswith("replica")
+        assert {answered_by(db) for _ in range(4)} == {first}
+
+def test_session_on_an_unhealthy_replica_moves_to_the_primary(routed):
+    with RoutingSession() as db:
+        first = answered_by(db)
+        replica = db.info["replica"]
+        routed.mark(replica, healthy=False)
+        # Not the other replica, and not back once it recovers
+        assert answered_by(db) == "primary"
+        routed.mark(replica, healthy=True)
+        assert answered_by(db) == "primary"
+    assert first == replica.name
+
+def test_reads_after_a_write_use_the_primary(routed):
+    with RoutingSession() as db:
+        db.add(Tenant(name="new", status="active"))
+        db.flush()
+        assert answered_by(db) == "primary"
+        db.rollback()
+
+def test_write_elsewhere_in_the_request_pins_reads_to_primary(routed):
+    token = request_writes.set({"wrote": False})
+    try:
+        with RoutingSession() as other:
+            other.add(Tenant(name="new", status="active"))
+            other.flush()
+            other.rollback()
+        with RoutingSession() as db:
+            assert answered_by(db) == "primary"
+    finally:
+        request_writes.reset(token)
+
+def test_unhealthy_replicas_fall_back_and_recover(routed):
+    for replica in routed.replicas:
+        routed.mark(replica, healthy=False)
+    with RoutingSession() as db:
+        assert answered_by(db) == "primary"
+
+    async def probe_and_close():
+        await routed.probe()
+        for replica in routed.replicas:
+            await replica.async_engine.dispose()
+
+    asyncio.run(probe_and_close())
+    assert all(replica.healthy for replica in routed.replicas)
+    with RoutingSession() as db:
+        assert answered_by(db).startswith("replica")
@@ -0,0 +1,80 @@
+"""
+Tests for the production startup schema check and phase timings
+"""
+
+import asyncio
+import httpx
+import pytest
+from sqlalchemy import create_engine, text
+from app.core.config import settings
+from app.core.startup import StartupTimer
+from app.db.init_db import SchemaRevisionError, check_revision, head_revisions
+from app.services.fayda_client import FaydaClient
+
+def write_migration(directory, revision, down_revision):
+    down = repr(down_revision)
+    (directory / f"{revision}_step.py").write_text(
+        f'"""step\n\nRevision ID: {revision}\nRevises: {down_revision}\n"""\n'
+        f"revision: str = '{revision}'\n"
+        f"down_revision: Union[str, None] = {down}\n"
+    )
+
+def versioned_engine(*versions):
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        for version in versions:
+            conn.execute(text("INSERT INTO alembic_version VALUES (:v)"), {"v": version})
+    return engine
+
+def test_head_revisions_follows_down_revisions(tmp_path):
+    write_migration(tmp_path, "aaa", None)
+    write_migration(tmp_path, "bbb", "aaa")
+    write_migration(tmp_path, "ccc", "bbb")
+    assert head_revisions(tmp_path) == {"ccc"}
+
+def test_head_revisions_of_shipped_migrations_is_single():
+    assert len(head_revisions()) == 1
+
+def test_check_revision_passes_at_head():
+    (head,) = head_revisions()
+    assert check_revision(versioned_engine(head)) == head
+
+def test_check_revision_rejects_stale_database():
+    with pytest.raises(SchemaRevisionError, match="expected"):
+        check_revision(versioned_engine("e209554cb282"))
+
+def test_check_revision_rejects_unmigrated_database():
+    with pytest.raises(SchemaRevisionError, match="alembic_version"):
+        check_revision(create_engine("sqlite://"))
+
+def test_expected_revision_setting_overrides_files(monkeypatch):
+    monkeypatch.setattr(settings, "db_expected_revision", "pinned")
+    assert check_revision(versioned_engine("pinned")) == "pinned"
+
+def test_startup_timer_accumulates_phases():
+    timer = StartupTimer()
+    timer.record("imports", 0.5)
+    with timer.phase("db_check"):
+        pass
+    timer.record("imports", 0.25)
+    timer.ready()
+    snapshot = timer.snapshot()
+    assert list(snapshot["phases_ms"]) == ["imports", "db_check"]
+    assert snapshot["phases_ms"]["imports"] == 750.0
+    assert snapshot["ready_ms"] >= 750.0
+
+def test_fayda_client_opens_on_first_lookup_without_startup():
+    client = FaydaClient(
+        base_url="http://fayda.test/api",
+        token="t",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True})),
+    )
+
+    async def main():
+        try:
+            return await client.check_id("1")
+        finally:
+            await client.shutdown()
+
+    assert asyncio.run(main()) == {"ok": True}
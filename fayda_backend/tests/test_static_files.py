@@ -0,0 +1,72 @@
+"""
+Tests for content ETags, immutable caching and conditional static responses
+"""
+
+import hashlib
+import os
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.static_files import IMMUTABLE, REVALIDATE, HashedStaticFiles
+
+HASHED = "a" * 64 + ".png"
+
+def make_client(tmp_path):
+    (tmp_path / HASHED).write_bytes(b"0123456789")
+    (tmp_path / "logo.png").write_bytes(b"first version")
+    app = FastAPI()
+    app.mount("/static", HashedStaticFiles(directory=tmp_path), name="static")
+    return TestClient(app)
+
+def test_hashed_name_is_immutable(tmp_path):
+    client = make_client(tmp_path)
+    response = client.get(f"/static/{HASHED}")
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert response.headers["etag"] == f'"{HASHED}"'
+
+def test_other_files_revalidate_against_content_etag(tmp_path):
+    client = make_client(tmp_path)
+    response = client.get("/static/logo.png")
+    assert response.headers["cache-control"] == REVALIDATE
+    assert response.headers["etag"] == '"%s"' % hashlib.sha256(b"first version").hexdigest()
+
+def test_matching_etag_gets_304(tmp_path):
+    client = make_client(tmp_path)
+    etag = client.get(f"/static/{HASHED}").headers["etag"]
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.get(f"/static/{HASHED}", headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == IMMUTABLE
+
+def test_replaced_file_gets_new_etag_despite_if_modified_since(tmp_path):
+    client = make_client(tmp_path)
+    first = client.get("/static/logo.png")
+    (tmp_path / "logo.png").write_bytes(b"second version!")
+    os.utime(tmp_path / "logo.png", (1, 1))
+
+    response = client.get(
+        "/static/logo.png",
+        headers={"If-None-Match": first.headers["etag"], "If-Modified-Since": first.headers["last-modified"]},
+    )
+    assert response.status_code == 200
+    assert response.content == b"second version!"
+    assert response.headers["etag"] != first.headers["etag"]
+
+def test_if_modified_since_alone(tmp_path):
+    client = make_client(tmp_path)
+    last_modified = client.get("/static/logo.png").headers["last-modified"]
+    response = client.get("/static/logo.png", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+def test_range_requests(tmp_path):
+    client = make_client(tmp_path)
+    etag = f'"{HASHED}"'
+    response = client.get(f"/static/{HASHED}", headers={"Range": "bytes=2-5", "If-Range": etag})
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == "bytes 2-5/10"
+
+    stale = client.get(f"/static/{HASHED}", headers={"Range": "bytes=2-5", "If-Range": '"old"'})
+    assert stale.status_code == 200
+    assert stale.content == b"0123456789"
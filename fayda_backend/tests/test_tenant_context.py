@@ -0,0 +1,46 @@
+"""
+Tests for transaction-scoped tenant context binding
+"""
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from app.db import session as db_session_module
+from app.db.session import SessionLocal, get_tenant_session, set_tenant_context
+
+@pytest.fixture
+def engine():
+    return create_engine("sqlite://")
+
+@pytest.fixture
+def bound(monkeypatch):
+    """Record tenant bindings instead of issuing set_config on a non-Postgres engine"""
+    calls = []
+    monkeypatch.setattr(db_session_module, "_apply_tenant_guc", lambda connection, tid: calls.append(tid))
+    return calls
+
+def test_tenant_bound_at_every_transaction_begin(engine, bound):
+    db = get_tenant_session("t-1")
+    db.bind = engine
+    db.execute(text("SELECT 1"))
+    db.commit()
+    db.execute(text("SELECT 1"))
+    db.close()
+    assert bound == ["t-1", "t-1"]
+
+def test_set_tenant_context_does_not_commit(engine, bound):
+    db = SessionLocal(bind=engine)
+    statements = []
+    event.listen(engine, "commit", lambda conn: statements.append("COMMIT"))
+
+    db.execute(text("SELECT 1"))
+    set_tenant_context(db, "t-2")
+    assert db.in_transaction()
+    assert bound == ["t-2"]
+    assert statements == []
+    db.close()
+
+def test_untenanted_session_binds_nothing(engine, bound):
+    db = SessionLocal(bind=engine)
+    db.execute(text("SELECT 1"))
+    db.close()
+    assert bound == []
@@ -0,0 +1,138 @@
+"""
+Tests for the tenant registry and token-based tenant resolution
+"""
+
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+from app.auth.jwt import TokenClaims
+from app.core.principal import Principal, principal_cache
+from app.db.base import Base, Tenant, User
+from app.db.init_db import ensure_default_tenant
+from app.deps.tenant import get_current_tenant_id
+from app.services.tenant_registry import DEFAULT_TENANT_NAME, TenantRegistry, tenant_registry
+
+@pytest.fixture
+def caches_to_clear():
+    return (tenant_registry, principal_cache)
+
+def add_tenant(db_session, name, status="active"):
+    tenant = Tenant(name=name, status=status)
+    db_session.add(tenant)
+    db_session.commit()
+    return tenant.id
+
+def test_lookup_is_cached_by_id_and_name(db_session, count_queries):
+    tenant_id = add_tenant(db_session, "acme")
+    registry = TenantRegistry(ttl=60, maxsize=10)
+    statements = count_queries(db_session)
+
+    assert registry.get(db_session, tenant_id).name == "acme"
+    assert registry.get(db_session, tenant_id).name == "acme"
+    assert registry.get_by_name(db_session, "acme").id == tenant_id
+    assert len(statements) == 1
+
+def test_default_tenant_created_once(db_session, count_queries):
+    registry = TenantRegistry(ttl=60, maxsize=10)
+    first = registry.get_or_create_default(db_session)
+    statements = count_queries(db_session)
+    assert registry.get_or_create_default(db_session) == first
+    assert statements == []
+    assert db_session.query(Tenant).count() == 1
+
+def test_expired_entry_is_refreshed(db_session):
+    tenant_id = add_tenant(db_session, "acme")
+    registry = TenantRegistry(ttl=0.01, maxsize=10)
+    assert registry.get(db_session, tenant_id).is_active
+
+    db_session.query(Tenant).filter(Tenant.id == tenant_id).update({"status": "suspended"})
+    db_session.commit()
+    time.sleep(0.02)
+    assert not registry.get(db_session, tenant_id).is_active
+
+async def with_async_session(fn):
+    """Run ``fn(db)`` against a fresh in-memory aiosqlite database"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            return await fn(db)
+    finally:
+        await engine.dispose()
+
+async def add_tenant_async(db, name, status="active"):
+    tenant = Tenant(name=name, status=status)
+    db.add(tenant)
+    await db.commit()
+    return tenant.id
+
+def test_tenant_resolved_from_token_claim(db_session, count_queries):
+    async def scenario(db):
+        tenant_id = await add_tenant_async(db, "acme")
+        claims = TokenClaims(sub="a@example.com", role="user", tenant_id=str(tenant_id), exp=None)
+        assert await get_current_tenant_id(claims, db) == tenant_id
+        statements = count_queries(db)
+        assert await get_current_tenant_id(claims, db) == tenant_id
+        assert statements == []
+
+    asyncio.run(with_async_session(scenario))
+
+def test_inactive_tenant_is_rejected(db_session):
+    async def scenario(db):
+        tenant_id = await add_tenant_async(db, "acme", status="suspended")
+        claims = TokenClaims(sub="a@example.com", role="user", tenant_id=str(tenant_id), exp=None)
+        with pytest.raises(HTTPException) as exc:
+            await get_current_tenant_id(claims, db)
+        assert exc.value.status_code == 403
+
+    asyncio.run(with_async_session(scenario))
+
+def legacy_claims(email):
+    """Claims of a token issued before the ``tenant_id`` claim existed"""
+    return TokenClaims(sub=email, role="user", tenant_id=None, exp=None)
+
+def test_legacy_token_resolves_the_users_tenant(db_session):
+    async def scenario(db):
+        tenant_id = await add_tenant_async(db, "acme")
+        db.add(User(tenant_id=tenant_id, full_name="A", email="a@example.com", hashed_password="x"))
+        await db.commit()
+        assert await get_current_tenant_id(legacy_claims("a@example.com"), db) == tenant_id
+
+    asyncio.run(with_async_session(scenario))
+
+def test_legacy_token_for_unknown_subject_is_401_without_writes(db_session, count_queries):
+    async def scenario(db):
+        statements = count_queries(db)
+        with pytest.raises(HTTPException) as exc:
+            await get_current_tenant_id(legacy_claims("ghost@example.com"), db)
+        assert exc.value.status_code == 401
+        assert all(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+        assert (await db.execute(select(Tenant))).all() == []
+
+    asyncio.run(with_async_session(scenario))
+
+def test_legacy_fallback_reads_the_default_tenant_but_never_creates_it(db_session):
+    principal_cache.set("a@example.com", Principal(
+        id=1, email="a@example.com", tenant_id=None, role="user", status="active",
+    ))
+
+    async def scenario(db):
+        with pytest.raises(HTTPException) as exc:
+            await get_current_tenant_id(legacy_claims("a@example.com"), db)
+        assert exc.value.status_code == 404
+        assert (await db.execute(select(Tenant))).all() == []
+
+        default_id = await add_tenant_async(db, DEFAULT_TENANT_NAME)
+        assert await get_current_tenant_id(legacy_claims("a@example.com"), db) == default_id
+
+    asyncio.run(with_async_session(scenario))
+
+def test_init_db_creates_the_default_tenant(db_session):
+    ensure_default_tenant(db_session.get_bind())
+    ensure_default_tenant(db_session.get_bind())
+    assert [t.name for t in db_session.query(Tenant)] == [DEFAULT_TENANT_NAME]